@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
 import os
 from pathlib import Path
 
+from ..config import Config
 from ..models import Folder, get_db
-from ..tasks import process_existing_images
+from ..tasks import process_existing_images, is_schedule_enabled, is_within_schedule_window
 from .. import globals
 
 router = APIRouter()
@@ -25,8 +26,7 @@ class FolderResponse(BaseModel):
     active: bool
     added_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class FileBrowserItem(BaseModel):
     name: str
@@ -73,10 +73,8 @@ def add_folder(folder: FolderCreate, background_tasks: BackgroundTasks, db: Sess
     # When outside the schedule window, skip AI processing — the
     # ScheduleChecker will pick up the new folder automatically when
     # the window opens.  If the schedule is disabled, process immediately.
-    from ..tasks import is_schedule_enabled, is_within_schedule_window
     if not is_schedule_enabled() or is_within_schedule_window():
         # Get Ollama settings from config or environment
-        from ..config import Config
         ollama_server_val = Config.get('ollama', 'server', fallback="http://127.0.0.1:11434")
         ollama_model_val = Config.get('ollama', 'model', fallback="qwen2.5vl:latest")
 
@@ -139,7 +137,6 @@ def scan_folder(folder_id: int, background_tasks: BackgroundTasks, db: Session =
 
     # Process images in the background (process_existing_images handles
     # schedule internally: queues as pending when outside the window)
-    from ..config import Config
     ollama_server_val = Config.get('ollama', 'server', fallback="http://127.0.0.1:11434")
     ollama_model_val = Config.get('ollama', 'model', fallback="qwen2.5vl:latest")
 
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 import os
 from pathlib import Path
@@ -17,8 +17,7 @@ class TagResponse(BaseModel):
     id: int
     name: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ImageResponse(BaseModel):
     id: int
@@ -28,11 +27,7 @@ class ImageResponse(BaseModel):
     processing_status: Optional[str] = None
     tags: List[TagResponse]
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat()
-        }
+    model_config = ConfigDict(from_attributes=True)
 
 class ImageListResponse(BaseModel):
     id: int
@@ -42,11 +37,7 @@ class ImageListResponse(BaseModel):
     processing_status: Optional[str] = None
     tags: List[TagResponse]
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat()
-        }
+    model_config = ConfigDict(from_attributes=True)
 
 @router.get("/images", response_model=List[ImageListResponse])
 def list_images(
@@ -64,7 +55,8 @@ def list_images(
     """
     offset = (page - 1) * limit
 
-    query = db.query(Image)
+    # Load the page's tags in one extra query rather than one per image
+    query = db.query(Image).options(selectinload(Image.tags))
 
     # Filter by processing status if specified
     if status and status != "all":
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from sqlalchemy import func
 
@@ -15,8 +15,7 @@ class TagCount(BaseModel):
     name: str
     count: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SearchResult(BaseModel):
     id: int
@@ -25,8 +24,7 @@ class SearchResult(BaseModel):
     processed_at: datetime
     tags: List[str]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 @router.get("/search", response_model=List[SearchResult])
 def search_images(
@@ -37,8 +35,8 @@ def search_images(
     """
     Search for images by text query and/or tags
     """
-    # Start with a base query
-    query = db.query(Image)
+    # Start with a base query; tags for all results come in one extra query
+    query = db.query(Image).options(selectinload(Image.tags))
     
     # Apply text search if provided
     if q:
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from typing import Dict, Any, List
 import requests
-import re
 import urllib.parse
 import os
 import shutil
@@ -41,20 +40,8 @@ class OllamaTestConfig(BaseModel):
 def get_config():
     """Get current configuration values"""
     try:
-        # Get the entire configuration
-        config_dict = {}
-        for section in Config.sections():
-            config_dict[section] = {}
-            for key, value in Config.items(section):
-                # Convert value types appropriately
-                if value.lower() in ['true', 'false']:
-                    config_dict[section][key] = value.lower() == 'true'
-                elif value.isdigit():
-                    config_dict[section][key] = int(value)
-                elif re.match(r'^-?\d+\.\d+$', value):
-                    config_dict[section][key] = float(value)
-                else:
-                    config_dict[section][key] = value
+        # Typed view is converted once per config change, not per request
+        config_dict = Config.typed_view()
 
         return {"message": "Configuration loaded successfully", "config": config_dict}
     except Exception as e:
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from PIL import Image as PILImage
 import io
 import os
 import time
@@ -12,6 +11,7 @@ import logging
 from ..models import Image
 from ..models import get_db
 from ..config import Config
+from ..utils import make_thumbnail
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -161,60 +161,33 @@ def get_thumbnail(image_id: int, size: int = 200, db: Session = Depends(get_db))
     
     try:
         # Open the image and create a thumbnail
-        with PILImage.open(image.path) as img:
-            # Convert RGBA to RGB if needed
-            if img.mode in ('RGBA', 'LA'):
-                # Create white background
-                background = PILImage.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'RGBA':
-                    background.paste(img, mask=img.split()[-1])
-                else:  # LA mode
-                    background.paste(img, mask=img.split()[-1])
-                img = background
-            elif img.mode == 'P':
-                # Convert palette mode to RGB
-                img = img.convert('RGB')
-            elif img.mode not in ('RGB', 'L'):
-                # Convert any other mode to RGB
-                img = img.convert('RGB')
-                
-            # Calculate new dimensions while preserving aspect ratio
-            width, height = img.size
-            if width > height:
-                new_width = size
-                new_height = int(height * (size / width))
-            else:
-                new_height = size
-                new_width = int(width * (size / height))
-                
-            # Create thumbnail with high-quality resampling
-            img.thumbnail((new_width, new_height), PILImage.Resampling.LANCZOS)
-            
-            # Get quality setting from config
-            quality = Config.getint('storage', 'thumbnail_quality', fallback=85)
-            
-            # Save to file cache
-            img.save(thumbnail_path, "JPEG", quality=quality, optimize=True)
-            
-            # Prepare response data
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format='JPEG', quality=quality, optimize=True)
-            thumbnail_data = img_byte_arr.getvalue()
-            
-            # Add to memory cache
-            manage_cache_size()
-            _thumbnail_cache[cache_key] = {
-                'data': thumbnail_data,
-                'timestamp': time.time()
-            }
-            
-            # Enforce cache size limit periodically
-            if len(_thumbnail_cache) % 50 == 0:  # Check every 50 new thumbnails
-                enforce_cache_size_limit()
-            
-            logger.debug(f"Thumbnail generated and cached: {cache_key}")
-            return Response(content=thumbnail_data, media_type="image/jpeg")
-            
+        img = make_thumbnail(image.path, size)
+        
+        # Get quality setting from config
+        quality = Config.getint('storage', 'thumbnail_quality', fallback=85)
+        
+        # Save to file cache
+        img.save(thumbnail_path, "JPEG", quality=quality, optimize=True)
+        
+        # Prepare response data
+        img_byte_arr = io.BytesIO()
+        img.save(img_byte_arr, format='JPEG', quality=quality, optimize=True)
+        thumbnail_data = img_byte_arr.getvalue()
+        
+        # Add to memory cache
+        manage_cache_size()
+        _thumbnail_cache[cache_key] = {
+            'data': thumbnail_data,
+            'timestamp': time.time()
+        }
+        
+        # Enforce cache size limit periodically
+        if len(_thumbnail_cache) % 50 == 0:  # Check every 50 new thumbnails
+            enforce_cache_size_limit()
+        
+        logger.debug(f"Thumbnail generated and cached: {cache_key}")
+        return Response(content=thumbnail_data, media_type="image/jpeg")
+        
     except Exception as e:
         logger.error(f"Error generating thumbnail for image {image_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Error generating thumbnail: {str(e)}")
@@ -1,9 +1,13 @@
 import os
+import mimetypes
+import stat
 import threading
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
 from fastapi import FastAPI, HTTPException, Request, Depends, APIRouter
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
 import logging
@@ -14,9 +18,8 @@ from .api import folders, images, search, settings as api_settings, thumbnails
 from . import models as db_models
 from . import globals
 from .config import Config
-from .utils import setup_application_logging, log_error_with_context
+from .utils import setup_application_logging, setup_logging, log_error_with_context
 from .tasks import start_folder_watchers, stop_folder_watchers, ScheduleChecker, _schedule_stop_event, scan_library_on_startup
-from .globals import AppState
 from .security import get_security_middleware
 
 # Initialize enhanced logging early
@@ -31,13 +34,13 @@ try:
         enable_structured=enable_structured
     )
 except Exception as e:
-    # Fallback to basic logging if enhanced setup fails
-    logging.basicConfig(level=logging.INFO)
+    # Fallback to console-only logging if enhanced setup fails
+    setup_logging("INFO")
     logging.error(f"Failed to setup enhanced logging: {e}")
 
 logger = logging.getLogger("image-webui")
 
-# Configuration is auto-loaded when config module is imported (Config.initialize())
+# Configuration is loaded lazily on first access (Config._ensure_initialized())
 config_available = True
 try:
     # Verify config is accessible
@@ -98,25 +101,11 @@ async def lifespan(app: FastAPI):
             logger.warning("WARNING: Binding to localhost only — remote machines will NOT be able to connect!")
         # --- End startup validation ---
 
-        # Get Ollama settings from config or environment
-        ollama_server_val = "http://127.0.0.1:11434"
-        ollama_model_val = "qwen2.5vl:latest"
-
-        if config_available:
-            server_from_config = Config.get('ollama', 'server', fallback=ollama_server_val)
-            model_from_config = Config.get('ollama', 'model', fallback=ollama_model_val)
-            
-            if server_from_config:
-                ollama_server_val = str(server_from_config)
-            if model_from_config:
-                ollama_model_val = str(model_from_config)
-            
-            logger.info(f"Using Ollama server: {ollama_server_val}")
-            logger.info(f"Using Ollama model: {ollama_model_val}")
-        else:
-            ollama_server_val = os.environ.get("OLLAMA_SERVER", ollama_server_val)
-            ollama_model_val = os.environ.get("OLLAMA_MODEL", ollama_model_val)
-            logger.info(f"Using Ollama server from environment: {ollama_server_val}")
+        # Get Ollama settings (environment overrides config)
+        ollama_server_val = Config.resolve('ollama', 'server', env='OLLAMA_SERVER', fallback="http://127.0.0.1:11434")
+        ollama_model_val = Config.resolve('ollama', 'model', env='OLLAMA_MODEL', fallback="qwen2.5vl:latest")
+        logger.info(f"Using Ollama server: {ollama_server_val}")
+        logger.info(f"Using Ollama model: {ollama_model_val}")
         
         # Start folder watchers (in background thread to avoid blocking startup
         # on large directories — observer.schedule() with recursive=True can
@@ -124,7 +113,7 @@ async def lifespan(app: FastAPI):
         def _start_watchers():
             try:
                 globals.observer = start_folder_watchers(
-                    None,  # No session needed - watchers create their own
+                    db_models.SessionLocal,  # Factory - each watcher task opens its own session
                     ollama_server_val,
                     ollama_model_val
                 )
@@ -263,16 +252,8 @@ except Exception as e:
 
 # Setup database
 try:
-    db_path_str = "sqlite:///data/image_tagger.db"
-    if config_available:
-        db_path_from_config = Config.get('database', 'path')
-        if db_path_from_config:
-            db_path_str = db_path_from_config
-    
     # Environment variable takes precedence
-    if 'DB_PATH' in os.environ:
-        db_path_str = os.environ["DB_PATH"]
-    
+    db_path_str = Config.resolve('database', 'path', env='DB_PATH', fallback="sqlite:///data/image_tagger.db")
     engine = db_models.get_db_engine(db_path_str)
     db_models.init_db(engine)
     logger.info(f"Database initialized: {db_path_str}")
@@ -290,23 +271,69 @@ try:
 except Exception as e:
     logger.error(f"Failed to mount static files: {e}")
 
-# Create and mount thumbnails directory
+# Create thumbnails directory (served by the /thumbnails route below)
+thumbnail_dir = Path(Config.resolve('storage', 'thumbnail_dir', fallback="data/thumbnails"))
 try:
-    thumbnail_dir_path_str = "data/thumbnails"
-    if config_available:
-        thumbnail_path_from_config = Config.get('storage', 'thumbnail_dir')
-        if thumbnail_path_from_config:
-            thumbnail_dir_path_str = thumbnail_path_from_config
-    
-    thumbnail_dir = Path(thumbnail_dir_path_str)
     if not thumbnail_dir.exists():
         thumbnail_dir.mkdir(parents=True)
-    
-    app.mount("/thumbnails", StaticFiles(directory=str(thumbnail_dir)), name="thumbnails")
-    logger.info(f"Thumbnails directory mounted: {thumbnail_dir}")
+    logger.info(f"Thumbnails directory: {thumbnail_dir}")
 except Exception as e:
     logger.error(f"Failed to setup thumbnails directory: {e}")
 
+THUMBNAIL_ROOT = thumbnail_dir.resolve()
+# Thumbnails up to this size are kept in memory after the first read
+THUMBNAIL_MEMORY_CACHE_MAX_BYTES = Config.getint('storage', 'thumbnail_max_size_cached_bytes', fallback=32768) or 0
+
+@lru_cache(maxsize=2048)
+def _read_cached_thumbnail(path: str, mtime_ns: int, size: int) -> bytes:
+    """Read a small thumbnail file; mtime/size are part of the key so edits invalidate it."""
+    with open(path, "rb") as f:
+        return f.read()
+
+def _thumbnail_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Conditional-request check matching what StaticFiles did for this directory."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip(" W/") for tag in if_none_match.split(",")]
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= int(mtime)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+@app.api_route("/thumbnails/{path:path}", methods=["GET", "HEAD"])
+def serve_thumbnail_file(path: str, request: Request):
+    """Serve files from the thumbnail directory, answering small ones from memory.
+
+    A plain def, so the resolve/stat/read calls run in the threadpool rather
+    than on the event loop.
+    """
+    file_path = (THUMBNAIL_ROOT / path).resolve()
+    if THUMBNAIL_ROOT not in file_path.parents:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    try:
+        stat_result = file_path.stat()
+    except OSError:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+
+    headers = {
+        "ETag": f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+    }
+    if _thumbnail_not_modified(request, headers["ETag"], stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if request.method == "GET" and stat_result.st_size <= THUMBNAIL_MEMORY_CACHE_MAX_BYTES:
+        data = _read_cached_thumbnail(str(file_path), stat_result.st_mtime_ns, stat_result.st_size)
+        media_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        return Response(content=data, media_type=media_type, headers=headers)
+    # FileResponse answers HEAD with the headers only
+    return FileResponse(file_path, stat_result=stat_result, headers=headers)
+
 # Image root for serving files — configurable for Docker vs bare-metal
 IMAGE_ROOT = os.environ.get("IMAGE_ROOT", "/")
 
@@ -327,9 +354,9 @@ async def serve_image(path: str):
 async def health_check():
     """Simple health check endpoint for monitoring."""
     try:
-        db = db_models.SessionLocal()
-        db.execute(db_models.text("SELECT 1"))
-        db.close()
+        # A pooled connection is enough for a liveness probe; skip building an ORM Session
+        with db_models.engine.connect() as conn:
+            conn.execute(db_models.text("SELECT 1"))
         return {"status": "ok", "db": "connected"}
     except Exception as e:
         return {"status": "degraded", "db": str(e)}
@@ -356,28 +383,29 @@ except Exception as e:
     logger.error(f"Failed to include API routers: {e}")
 
 # Define routes
+def render_page(request: Request, name: str):
+    """Render a page template; Jinja's own template cache still honours auto_reload"""
+    return templates.TemplateResponse(request=request, name=name, context={"request": request})
+
 @app.get("/")
 async def index(request: Request):
-    return templates.TemplateResponse(request=request, name="index.html", context={"request": request})
+    return render_page(request, "index.html")
 
 @app.get("/folders")
 async def folders_page(request: Request):
-    return templates.TemplateResponse(request=request, name="folders.html", context={"request": request})
+    return render_page(request, "folders.html")
 
 @app.get("/gallery")
 async def gallery_page(request: Request):
-    return templates.TemplateResponse(request=request, name="gallery.html", context={"request": request})
+    return render_page(request, "gallery.html")
 
 @app.get("/search")
 async def search_page(request: Request):
-    return templates.TemplateResponse(request=request, name="search.html", context={"request": request})
+    return render_page(request, "search.html")
 
 @app.get("/settings")
 async def settings_page(request: Request):
-    return templates.TemplateResponse(request=request, name="settings.html", context={"request": request})
-
-# Initialize global app state
-globals.app_state = AppState()
+    return render_page(request, "settings.html")
 
 # Error handlers
 @app.exception_handler(HTTPException)
@@ -400,12 +428,9 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 # Run the app if executed directly
 if __name__ == "__main__":
-    host_val = Config.get('general', 'host', fallback="0.0.0.0")
-    port_val = Config.getint('general', 'port', fallback=8491)
-
     # Environment variables take precedence
-    host_val = os.environ.get("HOST", host_val)
-    port_val = int(os.environ.get("PORT", str(port_val)))
+    host_val = Config.resolve('general', 'host', env="HOST", fallback="0.0.0.0")
+    port_val = int(Config.resolve('general', 'port', env="PORT", fallback=8491))
 
     logger.info(f"Starting Image Tagger WebUI on http://{host_val}:{port_val}")
     if host_val == "127.0.0.1" or host_val == "localhost":
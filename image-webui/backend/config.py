@@ -5,10 +5,11 @@ Handles loading and saving configuration from file and environment variables
 
 import os
 import configparser
+import re
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
-import json
+from typing import Any, Dict, Optional, Tuple
 
 # Set up logging
 logger = logging.getLogger("config")
@@ -74,7 +75,8 @@ DEFAULT_CONFIG = {
         "thumbnail_dir": "data/thumbnails",
         "thumbnail_max_size": "300",
         "thumbnail_quality": "85",
-        "max_cache_size_mb": "1000"
+        "max_cache_size_mb": "1000",
+        "thumbnail_max_size_cached_bytes": "32768"
     },
     "ui": {
         "items_per_page": "50",
@@ -97,6 +99,19 @@ DEFAULT_CONFIG = {
     }
 }
 
+# DEFAULT_CONFIG flattened to the same (section, key) -> str shape as the _values snapshot
+_FLAT_DEFAULTS: Dict[Tuple[str, str], str] = {
+    (section, key): value
+    for section, options in DEFAULT_CONFIG.items()
+    for key, value in options.items()
+}
+
+# DEFAULT_CONFIG pre-rendered as INI text so first-run setup is a single read_string()
+_DEFAULT_INI_BLOB = "\n\n".join(
+    f"[{section}]\n" + "\n".join(f"{key} = {value}" for key, value in options.items())
+    for section, options in DEFAULT_CONFIG.items()
+) + "\n"
+
 # Environment variable mappings
 ENV_MAPPINGS = {
     "GENERAL_HOST": ("general", "host"),
@@ -126,6 +141,7 @@ ENV_MAPPINGS = {
     "STORAGE_THUMBNAIL_MAX_SIZE": ("storage", "thumbnail_max_size"),
     "STORAGE_THUMBNAIL_QUALITY": ("storage", "thumbnail_quality"),
     "STORAGE_MAX_CACHE_SIZE_MB": ("storage", "max_cache_size_mb"),
+    "STORAGE_THUMBNAIL_MAX_SIZE_CACHED_BYTES": ("storage", "thumbnail_max_size_cached_bytes"),
     "UI_ITEMS_PER_PAGE": ("ui", "items_per_page"),
     "UI_DARK_THEME": ("ui", "dark_theme"),
     "UI_DEFAULT_SORT": ("ui", "default_sort"),
@@ -141,21 +157,110 @@ ENV_MAPPINGS = {
     "SCHEDULE_TIMEZONE": ("schedule", "timezone"),
 }
 
+# ENV_MAPPINGS grouped as {section: {env_var: key}} so overrides touch each section once
+_ENV_MAPPINGS_BY_SECTION: Dict[str, Dict[str, str]] = {}
+for _env_var, (_section, _key) in ENV_MAPPINGS.items():
+    _ENV_MAPPINGS_BY_SECTION.setdefault(_section, {})[_env_var] = _key
+del _env_var, _section, _key
+
 # Create a ConfigParser instance
 _parser = configparser.ConfigParser(interpolation=None)
 
+# Set once initialize() has run, so the existence check and file read happen once per
+# process; accessors call _ensure_initialized() so plain imports never read config.ini
+_initialized = False
+
+# st_mtime_ns of CONFIG_FILE as last read/written, so unchanged files aren't reparsed
+_loaded_mtime_ns: Optional[int] = None
+
+# Flat (section, key) -> raw string snapshot of _parser, so Config.get() is a
+# single dict lookup instead of configparser's section/option/default chain
+_values: Dict[Tuple[str, str], str] = {}
+
+# Nested {section: {key: typed value}} view served by the settings API, built
+# on first request after each change instead of re-converting every value per call
+_typed_view: Optional[Dict[str, Dict[str, Any]]] = None
+
+def _invalidate_converted():
+    """Drop values derived from _values; call after any change to it"""
+    global _typed_view
+    _typed_get.cache_clear()
+    _typed_view = None
+
+def _refresh_snapshot():
+    """Rebuild _values from _parser after a bulk change (e.g. reading the file)"""
+    _values.clear()
+    for section in _parser.sections():
+        for key, value in _parser.items(section):
+            _values[(section, key)] = value
+    _invalidate_converted()
+
+# Same spellings ConfigParser.getboolean accepts
+_BOOL_MAP = {
+    "true": True, "false": False,
+    "yes": True, "no": False,
+    "on": True, "off": False,
+    "1": True, "0": False,
+}
+
+def _to_bool(value: str) -> bool:
+    """Convert a raw config string the same way ConfigParser.getboolean does"""
+    try:
+        return _BOOL_MAP[value.lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value}")
+
+_CONVERTERS = {"bool": _to_bool, "int": int, "float": float}
+
+# Returned by _typed_get for absent keys so misses are memoized too
+_MISSING = object()
+
+@lru_cache(maxsize=256)
+def _typed_get(section: str, key: str, kind: str) -> Any:
+    """Convert a config value once; cleared by _invalidate_converted() on every change"""
+    raw = Config.get(section, key)
+    if raw is None:
+        return _MISSING
+    return _CONVERTERS[kind](raw)
+
+# Spellings shown as booleans in the settings view; a dict hit avoids lower() per value
+_DISPLAY_BOOLS = {
+    "true": True, "false": False,
+    "True": True, "False": False,
+    "TRUE": True, "FALSE": False,
+}
+
+# Numeric shapes shown as int/float in the settings view, compiled once
+_INT_RE = re.compile(r'^-?\d+$')
+_FLOAT_RE = re.compile(r'^-?\d+\.\d+$')
+
+def _coerce_value(value: str) -> Any:
+    """Best-effort conversion of a raw config string to bool/int/float for display"""
+    flag = _DISPLAY_BOOLS.get(value)
+    if flag is not None:
+        return flag
+    if _INT_RE.match(value):
+        return int(value)
+    if _FLOAT_RE.match(value):
+        return float(value)
+    return value
+
 class Config:
     """Configuration management class"""
     
     @classmethod
     def initialize(cls):
         """Initialize configuration from file and environment variables"""
-        # Create default config if it doesn't exist
-        if not os.path.exists(CONFIG_FILE):
-            cls._create_default_config()
+        global _initialized
+        # Flag first so accessors used below don't re-enter
+        _initialized = True
         
-        # Load the configuration
-        cls.load()
+        # Fall back to in-memory defaults if there is no file yet
+        if not CONFIG_FILE.exists():
+            cls._create_default_config()
+        else:
+            # Load the configuration
+            cls.load()
         
         # Apply environment variable overrides
         cls._apply_environment_overrides()
@@ -163,11 +268,28 @@ class Config:
         logger.info("Configuration initialized successfully")
     
     @classmethod
-    def load(cls):
-        """Load configuration from file"""
+    def _ensure_initialized(cls):
+        """Run initialize() on first access"""
+        if not _initialized:
+            cls.initialize()
+    
+    @classmethod
+    def load(cls, force=False):
+        """Load configuration from file, skipping the parse if it hasn't changed"""
+        global _loaded_mtime_ns
         try:
+            try:
+                mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+            except FileNotFoundError:
+                logger.warning(f"Configuration file {CONFIG_FILE} not found, using in-memory values")
+                return
+            if not force and mtime_ns == _loaded_mtime_ns:
+                logger.debug(f"Configuration unchanged since last read: {CONFIG_FILE}")
+                return
             # Read the configuration file
             _parser.read(CONFIG_FILE)
+            _refresh_snapshot()
+            _loaded_mtime_ns = mtime_ns
             logger.info(f"Configuration loaded from {CONFIG_FILE}")
         except Exception as e:
             logger.error(f"Error loading configuration: {str(e)}")
@@ -177,9 +299,13 @@ class Config:
     @classmethod
     def save(cls):
         """Save configuration to file"""
+        global _loaded_mtime_ns
+        cls._ensure_initialized()
         try:
             with open(CONFIG_FILE, 'w') as configfile:
                 _parser.write(configfile)
+            # What's on disk now matches _parser, so the next load() can skip it
+            _loaded_mtime_ns = CONFIG_FILE.stat().st_mtime_ns
             logger.info(f"Configuration saved to {CONFIG_FILE}")
             return True
         except Exception as e:
@@ -188,83 +314,123 @@ class Config:
     
     @classmethod
     def _create_default_config(cls):
-        """Create default configuration file"""
+        """Load the default configuration into memory.
+
+        Nothing is written to disk here; the file is created the first time
+        the configuration is explicitly saved (e.g. from the settings page).
+        """
         try:
-            # Create the minimum required sections and settings
-            for section, options in DEFAULT_CONFIG.items():
-                _parser.add_section(section)
-                for key, value in options.items():
-                    _parser.set(section, key, value)
-            
-            # Save the default configuration
-            cls.save()
-            logger.info(f"Default configuration created at {CONFIG_FILE}")
+            # Create the minimum required sections and settings in one pass
+            _parser.read_string(_DEFAULT_INI_BLOB)
+            # Defaults override whatever was there, exactly as read_string did
+            _values.update(_FLAT_DEFAULTS)
+            _invalidate_converted()
+            logger.info(f"Using default configuration (not yet saved to {CONFIG_FILE})")
         except Exception as e:
             logger.error(f"Error creating default configuration: {str(e)}")
     
     @classmethod
     def _apply_environment_overrides(cls):
         """Apply environment variable overrides to configuration"""
-        for env_var, (section, key) in ENV_MAPPINGS.items():
-            env_value = os.environ.get(env_var)
-            if env_value is not None:
-                if not _parser.has_section(section):
-                    _parser.add_section(section)
+        present = os.environ.keys() & ENV_MAPPINGS.keys()
+        if not present:
+            return
+        for section, overrides in _ENV_MAPPINGS_BY_SECTION.items():
+            names = present.intersection(overrides)
+            if not names:
+                continue
+            if not _parser.has_section(section):
+                _parser.add_section(section)
+            for env_var in names:
+                env_value = os.environ[env_var]
+                key = overrides[env_var]
                 _parser.set(section, key, env_value)
+                _values[(section, key)] = env_value
                 logger.debug(f"Environment override: {env_var}={env_value}")
+        _invalidate_converted()
     
     @classmethod
     def get(cls, section, key, fallback=None):
         """Get a configuration value"""
+        # Inlined _ensure_initialized(): get() is the hottest accessor
+        if not _initialized:
+            cls.initialize()
         try:
-            return _parser.get(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return fallback
+            return _values[(section, key)]
+        except KeyError:
+            pass
+        # configparser folds option names to lower case; match it on a miss
+        return _values.get((section, _parser.optionxform(key)), fallback)
+    
+    @classmethod
+    def resolve(cls, section, key, env=None, fallback=None):
+        """Get a configuration value, letting the ``env`` variable take precedence.
+
+        Empty config values are treated as unset and fall through to ``fallback``.
+        """
+        if env is not None:
+            env_value = os.environ.get(env)
+            if env_value is not None:
+                return env_value
+        value = cls.get(section, key)
+        return value if value else fallback
     
     @classmethod
     def getboolean(cls, section, key, fallback=None):
         """Get a boolean configuration value"""
-        try:
-            return _parser.getboolean(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return fallback
+        value = _typed_get(section, key, "bool")
+        return fallback if value is _MISSING else value
     
     @classmethod
     def getint(cls, section, key, fallback=None):
         """Get an integer configuration value"""
-        try:
-            return _parser.getint(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return fallback
+        value = _typed_get(section, key, "int")
+        return fallback if value is _MISSING else value
     
     @classmethod
     def getfloat(cls, section, key, fallback=None):
         """Get a float configuration value"""
-        try:
-            return _parser.getfloat(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return fallback
+        value = _typed_get(section, key, "float")
+        return fallback if value is _MISSING else value
     
     @classmethod
     def set(cls, section, key, value):
         """Set a configuration value"""
+        cls._ensure_initialized()
         try:
             if not _parser.has_section(section):
                 _parser.add_section(section)
-            _parser.set(section, key, str(value))
+            value = str(value)
+            _parser.set(section, key, value)
+            _values[(section, _parser.optionxform(key))] = value
+            _invalidate_converted()
             return True
         except Exception as e:
             logger.error(f"Error setting configuration value: {str(e)}")
             return False
     
+    @classmethod
+    def typed_view(cls) -> Dict[str, Dict[str, Any]]:
+        """Return every section as a dict of coerced values (shared; do not mutate)"""
+        global _typed_view
+        cls._ensure_initialized()
+        if _typed_view is None:
+            view: Dict[str, Dict[str, Any]] = {}
+            for (section, key), value in _values.items():
+                view.setdefault(section, {})[key] = _coerce_value(value)
+            _typed_view = view
+        return _typed_view
+    
     @classmethod
     def sections(cls):
         """Get all configuration sections"""
+        cls._ensure_initialized()
         return _parser.sections()
     
     @classmethod
     def items(cls, section):
         """Get all items in a section"""
+        cls._ensure_initialized()
         try:
             return _parser.items(section)
         except configparser.NoSectionError:
@@ -273,11 +439,13 @@ class Config:
     @classmethod
     def has_section(cls, section):
         """Check if a section exists"""
+        cls._ensure_initialized()
         return _parser.has_section(section)
     
     @classmethod
     def add_section(cls, section):
         """Add a new configuration section"""
+        cls._ensure_initialized()
         try:
             if not _parser.has_section(section):
                 _parser.add_section(section)
@@ -308,10 +476,9 @@ class Config:
             db_path = cls.get("database", "path")
             if db_path:
                 try:
-                    # Test if we can create a database engine
-                    from sqlalchemy import create_engine
-                    engine = create_engine(db_path)
-                    engine.dispose()
+                    # Parse the URL and resolve its dialect without building an engine
+                    from sqlalchemy.engine import make_url
+                    make_url(db_path).get_dialect()
                 except Exception as e:
                     validation_results["errors"].append(f"Invalid database path: {e}")
                     validation_results["valid"] = False
@@ -350,9 +517,11 @@ class Config:
     @classmethod
     def export_config(cls) -> Dict[str, Any]:
         """Export configuration as dictionary"""
-        config_dict = {}
-        for section in cls.sections():
-            config_dict[section] = dict(cls.items(section))
+        cls._ensure_initialized()
+        # One pass over the (section, key) snapshot; keys stay scoped to their section
+        config_dict: Dict[str, Dict[str, str]] = {}
+        for (section, key), value in _values.items():
+            config_dict.setdefault(section, {})[key] = value
         return config_dict
     
     @classmethod
@@ -368,6 +537,3 @@ class Config:
         except Exception as e:
             logger.error(f"Error importing configuration: {str(e)}")
             return False
-
-# Initialize the configuration when the module is imported
-Config.initialize()
@@ -1,8 +1,19 @@
 """Global variables for application state"""
-from typing import Optional, Union
+from typing import Final, Optional, Union
 
 class AppState:
     """Class to store global application state"""
+    __slots__ = (
+        "is_scanning",
+        "current_task",
+        "task_progress",
+        "task_total",
+        "completed_tasks",
+        "last_error",
+        "paused",
+        "cancel_requested",
+    )
+
     def __init__(self):
         self.is_scanning = False
         self.current_task: Optional[str] = None
@@ -15,12 +26,13 @@ class AppState:
     
     def update(self, data: dict):
         """Update the app state with new data"""
-        for key, value in data.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+        for key in data.keys() & _FIELDS:
+            setattr(self, key, data[key])
+
+_FIELDS = frozenset(AppState.__slots__)
 
-# Global application state
-app_state = AppState()
+# Global application state; mutate it in place, never rebind it
+app_state: Final[AppState] = AppState()
 
 # Global observer for watching folders
 observer = None
@@ -4,8 +4,13 @@ Image Search CLI Tool
 A command-line interface for searching images using the Image Tagger core functionality.
 """
 
+import os
 import sys
+import pickle
+import hashlib
 import argparse
+import time
+from itertools import islice
 from pathlib import Path
 
 # Add the backend directory to the path so we can import our modules
@@ -13,6 +18,106 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from image_tagger import core
 
+# Results of earlier runs, so re-running a query on an unchanged tree skips exiftool.
+# One entry per (root, query, recursive), overwritten by each fresh search; the
+# least recently written entries beyond SEARCH_CACHE_MAX_ENTRIES, and any older
+# than SEARCH_CACHE_MAX_AGE seconds, are removed whenever an entry is stored.
+SEARCH_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "image-tagger" / "search_cache"
+SEARCH_CACHE_MAX_ENTRIES = 64
+SEARCH_CACHE_MAX_AGE = 30 * 24 * 3600
+
+def directory_stamps(root, recursive):
+    """mtime_ns of root and, if recursive, of every directory below it.
+
+    Adding, removing or renaming a file changes its directory's mtime, and
+    exiftool -overwrite_original replaces a file by renaming over it, so this
+    notices retagged files too without a stat per file.
+    """
+    stamps = {}
+    dirs = [os.fspath(root)]
+    while dirs:
+        current = dirs.pop()
+        try:
+            stamps[current] = os.stat(current).st_mtime_ns
+            if recursive:
+                with os.scandir(current) as entries:
+                    dirs.extend(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            continue
+    return stamps
+
+def path_stamps(paths):
+    """mtime_ns of each path, so metadata edited in place in a cached match is noticed"""
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+    return stamps
+
+def stamps_current(stamps):
+    """True if none of the recorded paths changed (a new directory changes its parent)"""
+    for path, mtime_ns in stamps.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+def search_cache_path(root, query, recursive):
+    """Cache file for this search"""
+    key = hashlib.blake2b(f"{root.resolve()}|{query.lower()}|{recursive}".encode(), digest_size=16)
+    return SEARCH_CACHE_DIR / f"{key.hexdigest()}.pickle"
+
+def load_cached_results(cache_file, limit):
+    """Return cached matches if the tree is unchanged and they answer a search with this limit"""
+    try:
+        with open(cache_file, "rb") as f:
+            entry = pickle.load(f)
+        results = entry["results"]
+        stamps = entry["stamps"]
+        complete = entry["complete"]
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError):
+        return None
+    if not stamps_current(stamps):
+        return None
+    # A partial scan can still serve smaller limits; a complete one serves any limit
+    if complete or len(results) > limit:
+        return results[:limit + 1]
+    return None
+
+def store_cached_results(cache_file, results, complete, stamps):
+    """Best-effort write of search results; failures only cost the next run a rescan"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump({"results": results, "complete": complete, "stamps": stamps}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        return
+    prune_search_cache()
+
+def prune_search_cache():
+    """Drop cache entries past the age limit and all but the newest SEARCH_CACHE_MAX_ENTRIES"""
+    entries = []
+    for cache_file in SEARCH_CACHE_DIR.glob("*.pickle"):
+        try:
+            entries.append((cache_file.stat().st_mtime, cache_file))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    cutoff = time.time() - SEARCH_CACHE_MAX_AGE
+    for index, (mtime, cache_file) in enumerate(entries):
+        if index >= SEARCH_CACHE_MAX_ENTRIES or mtime < cutoff:
+            try:
+                cache_file.unlink()
+            except OSError:
+                pass
+
 def main():
     parser = argparse.ArgumentParser(
         description="Search for images using AI-generated descriptions and tags",
@@ -48,6 +153,15 @@ Examples:
         help="Maximum number of results to return (default: 20)"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and don't update the on-disk results cache. Cached results are "
+             "rechecked against directory and match mtimes, so use this after editing "
+             "metadata in place (e.g. exiftool -overwrite_original_in_place) on files "
+             "that did not match before"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -71,33 +185,41 @@ Examples:
         if args.recursive:
             print("(including subdirectories)")
         
-        # Use the core search functionality
-        results = core.search_images(
-            root_path=str(search_path),
-            query=args.query,
-            recursive=args.recursive
-        )
+        results = None
+        cache_file = None
+        if not args.no_cache:
+            cache_file = search_cache_path(search_path, args.query, args.recursive)
+            results = load_cached_results(cache_file, args.limit)
+        
+        if results is None:
+            # Stamped before searching, so changes made during the search invalidate it
+            stamps = directory_stamps(search_path, args.recursive) if cache_file is not None else {}
+            # Stream matches and stop as soon as we have one more than the limit,
+            # so small --limit values don't scan (and exiftool) the whole tree
+            matches = core.iter_search_images(
+                root_path=str(search_path),
+                query=args.query,
+                recursive=args.recursive
+            )
+            results = list(islice(matches, args.limit + 1))
+            if cache_file is not None:
+                stamps.update(path_stamps(results))
+                store_cached_results(cache_file, results, complete=len(results) <= args.limit, stamps=stamps)
         
         if not results:
             print("No images found matching your query.")
             return
         
-        # Limit results
+        has_more = len(results) > args.limit
         results = results[:args.limit]
         
-        print(f"\nFound {len(results)} matching images:")
-        print("-" * 80)
-        
-        for i, (image_path, description, tags) in enumerate(results, 1):
-            print(f"{i}. {image_path}")
-            if description:
-                print(f"   Description: {description}")
-            if tags:
-                print(f"   Tags: {', '.join(tags)}")
-            print()
-        
-        if len(results) == args.limit:
-            print(f"(Showing first {args.limit} results)")
+        # Build the whole report and write it once rather than print() per row
+        lines = [f"\nFound {len(results)} matching images:", "-" * 80]
+        lines.extend(f"{i}. {image_path}" for i, image_path in enumerate(results, 1))
+        lines.append("")
+        if has_more:
+            lines.append(f"(Showing first {args.limit} results)")
+        sys.stdout.write("\n".join(lines) + "\n")
             
     except Exception as e:
         print(f"Error during search: {e}")
@@ -3,17 +3,28 @@ import os
 import sys
 import base64
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import logging
 import io
+import mmap
 import shutil
 import re
 import yaml
 import subprocess
+import select
+import sqlite3
+import atexit
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import hashlib
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import count, islice
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageFile
 from PIL.PngImagePlugin import PngInfo
 from datetime import datetime
 from ..config import Config
@@ -30,6 +41,72 @@ except ImportError:
     logging.warning("⚠️ pillow_heif not available. HEIC/HEIF files may not be processed correctly.")
     logging.warning("Install with: pip install pillow-heif")
 
+# Optional non-cryptographic hash for file tracking (checksum_algo: xxh3)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Optional SIMD, multi-threaded hash for file tracking (checksum_algo: blake3)
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Optional libjpeg-turbo encoder, noticeably faster than PIL's JPEG save
+try:
+    import numpy as np
+    import simplejpeg
+    SIMPLEJPEG_AVAILABLE = True
+except ImportError:
+    SIMPLEJPEG_AVAILABLE = False
+
+# Optional OpenCV decode/resize/encode path, tried before Pillow when installed
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    OPENCV_AVAILABLE = False
+
+# Optional faster JSON parser for model-server replies and exiftool output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Accepts bytes or str; orjson's decode error subclasses json.JSONDecodeError
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Shared HTTP session so calls to the model server reuse keep-alive
+# connections instead of opening a new TCP connection per image.
+http_session = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0)
+http_session.mount("http://", _http_adapter)
+http_session.mount("https://", _http_adapter)
+
+# A server that passed its health check is trusted for this many seconds,
+# rather than probing it again before every image
+HEALTH_CHECK_TTL = 30
+_healthy_until = {}  # health-check URL -> time.monotonic() deadline
+
+def _recently_healthy(url):
+    return time.monotonic() < _healthy_until.get(url, 0.0)
+
+def _mark_health(url, healthy):
+    if healthy:
+        _healthy_until[url] = time.monotonic() + HEALTH_CHECK_TTL
+    else:
+        _healthy_until.pop(url, None)
+
+def _forget_health(server):
+    """Re-check the server before the next request (after a connection error)."""
+    for url in list(_healthy_until):
+        if url.startswith(f"{server}/"):
+            _mark_health(url, False)
+
 def detect_actual_image_format(file_path):
     """
     Detect the actual image format by reading file headers, regardless of extension.
@@ -45,12 +122,46 @@ def detect_actual_image_format(file_path):
     return None
 
 def load_config():
-    """Load configuration from YAML file or return defaults."""
+    """Load configuration from YAML file or return defaults.
+
+    The parsed file is cached until its mtime changes, so per-image callers
+    only pay for a stat and a shallow copy. Each call returns a new dict;
+    use override_config() for process-wide changes such as CLI flags.
+    """
     # Prefer a system-wide configuration file if present
-    system_config_path = Path("/etc/image-tagger/config.yaml")
-    repo_config_path = Path(__file__).parent.parent.parent / "config.yaml"
-    config_path = system_config_path if system_config_path.exists() else repo_config_path
-    
+    # (one stat per candidate: it both picks the file and keys the cache)
+    for config_path in (_SYSTEM_CONFIG_PATH, _REPO_CONFIG_PATH):
+        try:
+            config = _load_config_file(config_path, config_path.stat().st_mtime_ns)
+            break
+        except OSError:
+            continue
+    else:
+        config = _load_config_file(_REPO_CONFIG_PATH, None)
+    return {**config, **_config_overrides}
+
+def override_config(**values):
+    """Apply values on top of the configuration file for the rest of this process."""
+    _config_overrides.update(values)
+
+def clear_config_cache():
+    """Forget the parsed configuration file so the next load_config() re-reads it."""
+    _load_config_file.cache_clear()
+
+# Set by override_config(); layered over every load_config() result
+_config_overrides = {}
+
+_SYSTEM_CONFIG_PATH = Path("/etc/image-tagger/config.yaml")
+_REPO_CONFIG_PATH = Path(__file__).parent.parent.parent / "config.yaml"
+# The web UI's data directory (next to data/config.ini and the app database)
+_DEFAULT_TRACKER_DB = Path(__file__).parent.parent.parent / "data" / "image-tagger-tracking.sqlite"
+
+# libyaml-backed loader when PyYAML was built with it; same results, much faster
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@lru_cache(maxsize=1)
+def _load_config_file(config_path, mtime_ns):
+    """Parse config_path over the defaults; mtime_ns only keys the cache."""
     default_config = {
         "server": "http://127.0.0.1:11434",
         "model": "qwen2.5vl:latest",
@@ -58,9 +169,15 @@ def load_config():
         "metadata_max_retries": 5,
         "exiftool_timeout_seconds": 60,
         "llm_max_dimension": 1024,
+        "fast_resize": False,
         "max_tags": 25,
         "use_file_tracking": True,
+        "checksum_algo": "sha256",
+        "checksum_max_bytes": 0,
+        "prefetch_depth": 2,
+        "concurrency": 1,
         "tracking_db_path": "/var/log/image-tagger.db",
+        "tracking_sqlite_path": str(_DEFAULT_TRACKER_DB),
         "process_newest_first": True,
         "enable_fallback_methods": True,
         "sidecar_dir": None,
@@ -68,10 +185,10 @@ def load_config():
         "supported_formats": ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.heic', '.heif', '.tif', '.tiff', '.webp', '.avif']
     }
     
-    if config_path.exists():
+    if mtime_ns is not None:
         try:
             with open(config_path, 'r') as f:
-                file_config = yaml.safe_load(f) or {}
+                file_config = yaml.load(f, Loader=_YamlLoader) or {}
                 default_config.update(file_config)
         except Exception as e:
             logging.warning(f"Error loading config file: {e}")
@@ -96,6 +213,207 @@ def run_cmd_with_timeout(cmd, timeout_seconds=60, capture_output=True, text=True
     except Exception as e:
         return 1, "", str(e)
 
+class _ExifToolDaemon:
+    """A single long-running ``exiftool -stay_open`` process.
+
+    exiftool is a Perl program and spends ~200 ms starting up on every call,
+    which dominates metadata writes once inference runs in parallel. This keeps
+    one process open and streams argument lists to it over stdin instead.
+    Calls are serialised with a lock; the process is (re)started on demand.
+    run_exiftool spreads calls over a few of these (EXIFTOOL_PROCESSES).
+    """
+
+    def __init__(self):
+        self._proc = None
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            ["exiftool", "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def _kill(self):
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            try:
+                proc.kill()
+                proc.wait(timeout=5)
+            except Exception:
+                pass
+
+    def close(self):
+        """Ask exiftool to exit cleanly (registered with atexit)."""
+        with self._lock:
+            proc, self._proc = self._proc, None
+            if proc is None or proc.poll() is not None:
+                return
+            try:
+                proc.stdin.write(b"-stay_open\nFalse\n")
+                proc.stdin.flush()
+                proc.wait(timeout=5)
+            except Exception:
+                proc.kill()
+
+    def execute(self, args, timeout_seconds=60, blocking=True):
+        """Run one exiftool command. Returns (rc, stdout, stderr) like run_cmd_with_timeout.
+
+        With blocking=False, returns None straight away if another call is running.
+        """
+        if not self._lock.acquire(blocking):
+            return None
+        try:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            self._seq += 1
+            seq = self._seq
+            # -echo4 prints "=<exit status>=post<seq>" to stderr once the command
+            # has finished, and -execute<seq> terminates stdout with "{ready<seq>}".
+            payload = "\n".join([*args, "-echo4", f"=${{status}}=post{seq}", f"-execute{seq}"]) + "\n"
+            out_marker = f"{{ready{seq}}}".encode()
+            err_marker = f"=post{seq}".encode()
+            try:
+                # surrogateescape turns names that are not valid UTF-8 (as
+                # os.fsdecode left them) back into their original bytes
+                self._proc.stdin.write(payload.encode("utf-8", "surrogateescape"))
+                self._proc.stdin.flush()
+                out, err = self._read_until(out_marker, err_marker, time.monotonic() + timeout_seconds)
+            except subprocess.TimeoutExpired:
+                self._kill()
+                return 124, "", f"Timeout after {timeout_seconds}s"
+            except OSError:
+                self._kill()
+                raise
+        finally:
+            self._lock.release()
+
+        out = out[:out.rfind(out_marker)]
+        marker_at = err.rfind(err_marker)
+        line_start = err.rfind(b"\n", 0, marker_at) + 1
+        status = err[line_start:marker_at].strip(b"=")
+        err = err[:line_start]
+        if status.isdigit():
+            rc = int(status)
+        else:
+            # exiftool older than 12.x does not expand ${status}
+            rc = 1 if b"Error" in err else 0
+        return rc, out.decode("utf-8", "replace"), err.decode("utf-8", "replace")
+
+    def _read_until(self, out_marker, err_marker, deadline):
+        buffers = {
+            self._proc.stdout.fileno(): bytearray(),
+            self._proc.stderr.fileno(): bytearray(),
+        }
+        out_buf, err_buf = buffers.values()
+        while out_marker not in out_buf or err_marker not in err_buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired("exiftool", remaining)
+            readable, _, _ = select.select(list(buffers), [], [], remaining)
+            for fd in readable:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    raise OSError("exiftool exited unexpectedly")
+                buffers[fd].extend(chunk)
+        return bytes(out_buf), bytes(err_buf)
+
+
+# Concurrent images (--concurrency) would otherwise queue behind a single
+# exiftool; processes are only started once a call actually needs one
+EXIFTOOL_PROCESSES = 4
+
+# select() on pipes is POSIX-only; elsewhere every call spawns its own exiftool.
+_exiftool_daemons = tuple(_ExifToolDaemon() for _ in range(EXIFTOOL_PROCESSES)) if os.name == "posix" else ()
+for _daemon in _exiftool_daemons:
+    atexit.register(_daemon.close)
+_next_daemon = count()
+
+
+def _argfile_safe(args):
+    """True if args survive exiftool's one-argument-per-line -@ format unchanged."""
+    for arg in args:
+        if not arg or "\n" in arg or "\r" in arg or arg != arg.strip() or arg.startswith("#"):
+            return False
+    return True
+
+
+def _argfile_args(args):
+    """args in a form exiftool's -@ format can carry, or None if there is none.
+
+    Multi-line tag values (model descriptions often have several paragraphs)
+    are C-escaped and decoded again by -ec, so they need no process of their own.
+    """
+    if _argfile_safe(args):
+        return args
+    escaped = ["-ec"]
+    for arg in args:
+        if "\n" in arg or "\r" in arg or "\\" in arg:
+            if not (arg.startswith("-") and "=" in arg):
+                return None  # a file name, which -ec does not decode
+            arg = arg.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+        escaped.append(arg)
+    return escaped if _argfile_safe(escaped) else None
+
+
+def run_exiftool(cmd, timeout_seconds=60):
+    """Run an ``["exiftool", ...]`` command through the shared -stay_open process.
+
+    Falls back to a one-off subprocess when the daemon is unavailable or the
+    arguments cannot be expressed in an argfile. Returns (rc, stdout, stderr).
+    """
+    args = _argfile_args(cmd[1:]) if _exiftool_daemons else None
+    if args is not None:
+        try:
+            # The first idle process, else wait for one in turn
+            for daemon in _exiftool_daemons:
+                result = daemon.execute(args, timeout_seconds, blocking=False)
+                if result is not None:
+                    return result
+            daemon = _exiftool_daemons[next(_next_daemon) % len(_exiftool_daemons)]
+            return daemon.execute(args, timeout_seconds)
+        except OSError as e:
+            logging.debug(f"exiftool -stay_open unavailable, running one-off: {e}")
+    return run_cmd_with_timeout(cmd, timeout_seconds=timeout_seconds)
+
+# Fallbacks for model replies that are almost-but-not-quite JSON. Compiled once;
+# re.ASCII keeps \s to plain JSON whitespace and skips Unicode class lookups.
+DESCRIPTION_FIELD_RE = re.compile(r'"description"\s*:\s*"((?:[^"\\]|\\.)*)"', re.DOTALL | re.ASCII)
+REPLY_DESCRIPTION_RE = re.compile(r'"description"\s*:\s*"((?:[^"\\]|\\.)*)\s*"', re.ASCII)
+TAGS_FIELD_RE = re.compile(r'"tags"\s*:\s*\[(.*?)\]', re.DOTALL | re.ASCII)
+
+def parse_reply_content(content):
+    """
+    Pull (description, tags) out of a model reply that should hold the JSON
+    contract, tolerating markdown code fences and malformed JSON. Either may
+    be None; a reply with no recognisable description becomes the description.
+    """
+    content = content.strip()
+    # Strip markdown code fences if present
+    cleaned = content
+    if cleaned.startswith('```'):
+        cleaned = '\n'.join(l for l in cleaned.split('\n') if not l.strip().startswith('```')).strip()
+    description = tags = None
+    try:
+        inner = json_loads(cleaned)
+        if isinstance(inner, dict):
+            description = (inner.get('description') or '').strip() or None
+            tags = normalize_tags(inner.get('tags') or [])
+    except Exception:
+        # Try regex extraction as fallback
+        desc_match = REPLY_DESCRIPTION_RE.search(cleaned)
+        if desc_match:
+            description = desc_match.group(1).strip()
+        tags_match = TAGS_FIELD_RE.search(cleaned)
+        if tags_match:
+            tags = [t.strip().strip('"').strip("'") for t in tags_match.group(1).split(',')]
+            tags = normalize_tags([t for t in tags if t])
+        if not description:
+            description = content
+    return description, tags
+
 def clean_description(description):
     """Strip JSON wrappers that may leak through from AI responses.
 
@@ -121,7 +439,7 @@ def clean_description(description):
     except (json.JSONDecodeError, ValueError):
         pass
     # Try regex extraction if the string looks like it contains a description key
-    match = re.search(r'"description"\s*:\s*"((?:[^"\\]|\\.)*)"', text, re.DOTALL)
+    match = DESCRIPTION_FIELD_RE.search(text)
     if match:
         extracted = match.group(1).strip()
         if extracted:
@@ -160,15 +478,138 @@ def normalize_tags(tags):
             break
     return normalized
 
-def get_file_checksum(file_path):
-    """Calculate SHA256 checksum of a file."""
+# Read size for the pre-3.11 checksum fallback
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+# hashlib.sha256 is OpenSSL-backed, which already dispatches to SHA-NI / ARMv8 SHA
+# instructions at runtime. xxh3 is far faster still but only detects changes, so it
+# is opt-in for trusted libraries; switching algorithms makes every file look new once.
+CHECKSUM_FACTORIES = {"sha256": hashlib.sha256}
+if XXHASH_AVAILABLE:
+    CHECKSUM_FACTORIES["xxh3"] = xxhash.xxh3_64
+if BLAKE3_AVAILABLE:
+    CHECKSUM_FACTORIES["blake3"] = blake3.blake3
+_warned_checksum_algos = set()
+
+# Linux/BSD only; pages are not dropped afterwards because the image is
+# usually read again right away for encoding.
+_posix_fadvise = getattr(os, "posix_fadvise", None)
+
+def get_file_checksum(file_path, algo="sha256", max_bytes=0):
+    """Calculate a checksum (SHA256 by default) of a file without loading it into memory.
+
+    With max_bytes > 0, files larger than that are identified by their first
+    max_bytes plus their size, which is enough to notice re-tagging (metadata
+    sits at the start of the file) without reading large files end to end.
+    """
+    factory = CHECKSUM_FACTORIES.get(algo)
+    if factory is None:
+        if algo not in _warned_checksum_algos:
+            _warned_checksum_algos.add(algo)
+            logging.warning(f"⚠️ Checksum algorithm '{algo}' not available, using sha256")
+        factory = hashlib.sha256
     try:
-        with open(file_path, 'rb') as f:
-            return hashlib.sha256(f.read()).hexdigest()
+        if factory is CHECKSUM_FACTORIES.get("blake3") and max_bytes <= 0:
+            # blake3 can memory-map the file and hash chunks on all cores
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            if hasattr(hasher, "update_mmap"):
+                return hasher.update_mmap(file_path).hexdigest()
+        # Unbuffered: file_digest/readinto fill their own buffer straight from the fd
+        with open(file_path, 'rb', buffering=0) as f:
+            if _posix_fadvise is not None:
+                # Checksum reads are strictly sequential: ask for aggressive readahead
+                _posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            size = os.fstat(f.fileno()).st_size
+            if max_bytes > 0 and size > max_bytes:
+                file_hash = factory(f.read(max_bytes))
+                file_hash.update(str(size).encode('ascii'))
+                return file_hash.hexdigest()
+            if size >= CHECKSUM_CHUNK_SIZE:
+                # Large files are hashed straight from the page cache in one call
+                # (no copy into a read buffer, GIL released for the whole file)
+                try:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    mapped = None
+                if mapped is not None:
+                    with mapped:
+                        if hasattr(mapped, "madvise"):
+                            mapped.madvise(mmap.MADV_SEQUENTIAL)
+                        return factory(mapped).hexdigest()
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: the read/update loop runs in C
+                return hashlib.file_digest(f, factory).hexdigest()
+            file_hash = factory()
+            buf = bytearray(CHECKSUM_CHUNK_SIZE)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                file_hash.update(view[:n])
+            return file_hash.hexdigest()
     except Exception as e:
         logging.error(f"Error calculating checksum for {file_path}: {e}")
         return None
 
+# Vocabulary matched by extract_tags_from_description, built once at import.
+# Tags only count as whole words (optionally pluralised with -s/-es), so "that"
+# does not yield "hat" and "covered" does not yield "red".
+_OBJECT_TAGS = (
+    'person', 'people', 'man', 'woman', 'child', 'baby', 'animal', 'dog', 'cat', 'bird', 'fish',
+    'car', 'truck', 'bike', 'bicycle', 'boat', 'plane', 'train', 'building', 'house', 'tree',
+    'flower', 'mountain', 'ocean', 'lake', 'river', 'beach', 'forest', 'desert', 'city', 'street',
+    'road', 'bridge', 'sky', 'cloud', 'sun', 'moon', 'star', 'night', 'day', 'sunset', 'sunrise',
+    'indoor', 'outdoor', 'nature', 'urban', 'rural', 'landscape', 'portrait', 'group', 'family',
+    'food', 'drink', 'furniture', 'clothing', 'shoe', 'hat', 'bag', 'phone', 'computer', 'book'
+)
+
+# Scene and mood tags
+_SCENE_TAGS = (
+    'bright', 'dark', 'colorful', 'black and white', 'vintage', 'modern', 'classic', 'artistic',
+    'professional', 'casual', 'formal', 'informal', 'busy', 'quiet', 'empty', 'crowded', 'peaceful',
+    'chaotic', 'organized', 'messy', 'clean', 'dirty', 'new', 'old', 'worn', 'pristine'
+)
+
+_COLOR_TAGS = ('red', 'blue', 'green', 'yellow', 'orange', 'purple', 'pink', 'brown', 'black', 'white', 'gray', 'grey')
+_TIME_TAGS = ('morning', 'afternoon', 'evening', 'night', 'dawn', 'dusk', 'midday', 'midnight')
+_WEATHER_TAGS = ('sunny', 'cloudy', 'rainy', 'snowy', 'foggy', 'stormy', 'clear', 'overcast')
+
+# All of the above, de-duplicated ('night' is in two lists)
+DESCRIPTION_TAGS = tuple(dict.fromkeys(_OBJECT_TAGS + _SCENE_TAGS + _COLOR_TAGS + _TIME_TAGS + _WEATHER_TAGS))
+# Position in the vocabulary; hits are returned in this order, so the 15-tag
+# cap keeps objects before scenes, colours, times and weather
+_TAG_RANK = {tag: rank for rank, tag in enumerate(DESCRIPTION_TAGS)}
+
+# With pyahocorasick installed, all tags are found in a single pass over the
+# description and only the (few) hits get a word-boundary check. Otherwise the
+# description is split into words once and intersected with the single-word
+# tags; only the handful of multi-word tags need a (precompiled) regex.
+try:
+    import ahocorasick
+    _TAG_AUTOMATON = ahocorasick.Automaton()
+    for _tag in DESCRIPTION_TAGS:
+        _TAG_AUTOMATON.add_word(_tag, _tag)
+    _TAG_AUTOMATON.make_automaton()
+except ImportError:
+    _TAG_AUTOMATON = None
+
+_SINGLE_WORD_TAGS = frozenset(tag for tag in DESCRIPTION_TAGS if ' ' not in tag)
+_MULTI_WORD_TAG_RE = re.compile(r'\b(?=(%s)(?:e?s)?\b)' % '|'.join(
+    re.escape(tag) for tag in sorted((t for t in DESCRIPTION_TAGS if ' ' in t), key=len, reverse=True)))
+_WORD_RE = re.compile(r'[^\W_]+')  # runs of letters/digits, matching str.isalnum()
+
+def _is_word_hit(text, start, end):
+    """True if text[start:end] stands alone as a word, allowing a plural -s/-es after it."""
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    for suffix in ('', 's', 'es'):
+        if text.startswith(suffix, end):
+            stop = end + len(suffix)
+            if stop >= len(text) or not text[stop].isalnum():
+                return True
+    return False
+
 def extract_tags_from_description(description):
     """Extract relevant tags from AI-generated description."""
     if not description:
@@ -177,57 +618,18 @@ def extract_tags_from_description(description):
     # Convert to lowercase for processing
     desc_lower = description.lower()
     
-    # Common object and scene tags
-    object_tags = [
-        'person', 'people', 'man', 'woman', 'child', 'baby', 'animal', 'dog', 'cat', 'bird', 'fish',
-        'car', 'truck', 'bike', 'bicycle', 'boat', 'plane', 'train', 'building', 'house', 'tree',
-        'flower', 'mountain', 'ocean', 'lake', 'river', 'beach', 'forest', 'desert', 'city', 'street',
-        'road', 'bridge', 'sky', 'cloud', 'sun', 'moon', 'star', 'night', 'day', 'sunset', 'sunrise',
-        'indoor', 'outdoor', 'nature', 'urban', 'rural', 'landscape', 'portrait', 'group', 'family',
-        'food', 'drink', 'furniture', 'clothing', 'shoe', 'hat', 'bag', 'phone', 'computer', 'book'
-    ]
-    
-    # Scene and mood tags
-    scene_tags = [
-        'bright', 'dark', 'colorful', 'black and white', 'vintage', 'modern', 'classic', 'artistic',
-        'professional', 'casual', 'formal', 'informal', 'busy', 'quiet', 'empty', 'crowded', 'peaceful',
-        'chaotic', 'organized', 'messy', 'clean', 'dirty', 'new', 'old', 'worn', 'pristine'
-    ]
-    
-    # Extract tags that appear in the description
-    found_tags = []
-    
-    # Check for object tags
-    for tag in object_tags:
-        if tag in desc_lower:
-            found_tags.append(tag)
-    
-    # Check for scene tags
-    for tag in scene_tags:
-        if tag in desc_lower:
-            found_tags.append(tag)
-    
-    # Extract color mentions
-    colors = ['red', 'blue', 'green', 'yellow', 'orange', 'purple', 'pink', 'brown', 'black', 'white', 'gray', 'grey']
-    for color in colors:
-        if color in desc_lower:
-            found_tags.append(color)
-    
-    # Extract time of day
-    time_tags = ['morning', 'afternoon', 'evening', 'night', 'dawn', 'dusk', 'midday', 'midnight']
-    for time_tag in time_tags:
-        if time_tag in desc_lower:
-            found_tags.append(time_tag)
-    
-    # Extract weather conditions
-    weather_tags = ['sunny', 'cloudy', 'rainy', 'snowy', 'foggy', 'stormy', 'clear', 'overcast']
-    for weather_tag in weather_tags:
-        if weather_tag in desc_lower:
-            found_tags.append(weather_tag)
-    
-    # Remove duplicates and limit to reasonable number
-    unique_tags = list(set(found_tags))
-    return unique_tags[:15]  # Limit to 15 tags max
+    # Tags that appear in the description, without duplicates
+    if _TAG_AUTOMATON is not None:
+        found = {tag for last, tag in _TAG_AUTOMATON.iter(desc_lower)
+                 if _is_word_hit(desc_lower, last - len(tag) + 1, last + 1)}
+    else:
+        words = set(_WORD_RE.findall(desc_lower))
+        found = words & _SINGLE_WORD_TAGS
+        # Plurals: "dogs" -> "dog", "beaches" -> "beach"
+        found.update(w[:-1] for w in words if w.endswith('s') and w[:-1] in _SINGLE_WORD_TAGS)
+        found.update(w[:-2] for w in words if w.endswith('es') and w[:-2] in _SINGLE_WORD_TAGS)
+        found.update(_MULTI_WORD_TAG_RE.findall(desc_lower))
+    return sorted(found, key=_TAG_RANK.__getitem__)[:15]  # Limit to 15 tags max
 
 def encode_image_to_base64_fallback(image_path, method="pillow"):
     """
@@ -235,86 +637,194 @@ def encode_image_to_base64_fallback(image_path, method="pillow"):
     
     Args:
         image_path: Path to the image file
-        method: Processing method ("pillow", "convert", "ffmpeg")
+        method: Processing method ("opencv", "pillow", "convert", "ffmpeg")
     
     Returns:
         Base64 encoded string or None on failure
     """
+    encoder = ENCODERS.get(method)
+    if encoder is None:
+        logging.error(f"Unknown encoding method: {method}")
+        return None
     try:
-        if method == "pillow":
-            return encode_image_to_base64_pillow(image_path)
-        elif method == "convert":
-            return encode_image_to_base64_convert(image_path)
-        elif method == "ffmpeg":
-            return encode_image_to_base64_ffmpeg(image_path)
-        else:
-            logging.error(f"Unknown encoding method: {method}")
-            return None
+        return encoder(image_path)
     except Exception as e:
         logging.error(f"Error with {method} encoding for {image_path}: {e}")
         return None
 
+# Formats handed to OpenCV; anything with transparency, 16-bit depth, several
+# frames or HEIC stays with Pillow, which handles those cases explicitly.
+_OPENCV_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.bmp', '.webp'))
+
+# JPEGs within llm_max_dimension are sent without being decoded, unless the
+# file is bloated (huge EXIF/ICC blocks, quality 100) beyond this size
+JPEG_PASSTHROUGH_MAX_BYTES = 2 * 1024 * 1024
+
+def _jpeg_passthrough(image_path, img, max_dimension):
+    """Return the file itself base64-encoded if it can be sent unchanged, else None."""
+    if (img.format == 'JPEG' and img.mode in ('RGB', 'L')
+            and max(img.size) <= max_dimension):
+        raw = image_path.read_bytes()
+        if len(raw) <= JPEG_PASSTHROUGH_MAX_BYTES:
+            return base64.b64encode(raw).decode('ascii')
+    return None
+
+def encode_image_to_base64_opencv(image_path):
+    """Convert image to base64 using OpenCV (SIMD decode, resize and encode).
+
+    JPEGs small enough to be sent unchanged are returned as-is; None is
+    returned for images better left to Pillow, so the caller simply moves on.
+    """
+    image_path = Path(image_path)
+    if image_path.suffix.lower() not in _OPENCV_EXTENSIONS:
+        return None
+    cfg = load_config()
+    max_dimension = int(cfg.get("llm_max_dimension", 1024))
+    try:
+        with Image.open(image_path) as probe:  # header only
+            width, height = probe.size
+            if probe.format == 'JPEG' and max(width, height) <= max_dimension:
+                return _jpeg_passthrough(image_path, probe, max_dimension)
+            # IMREAD_COLOR drops alpha and reads only the first frame, so
+            # transparent (e.g. WebP, 32-bit BMP) and animated files go to Pillow
+            if (probe.mode in ('RGBA', 'LA', 'PA') or 'transparency' in probe.info
+                    or getattr(probe, 'n_frames', 1) > 1):
+                return None
+    except Exception:
+        return None
+
+    # For JPEG, libjpeg can decode straight to 1/2, 1/4 or 1/8 size
+    flags = cv2.IMREAD_COLOR
+    ratio = max(width, height) // max_dimension
+    if ratio >= 8:
+        flags = cv2.IMREAD_REDUCED_COLOR_8
+    elif ratio >= 4:
+        flags = cv2.IMREAD_REDUCED_COLOR_4
+    elif ratio >= 2:
+        flags = cv2.IMREAD_REDUCED_COLOR_2
+    # imread applies EXIF orientation, which the Pillow encoder and the JPEG
+    # passthrough do not: keep every path sending the pixels as stored
+    img = cv2.imread(str(image_path), flags | cv2.IMREAD_IGNORE_ORIENTATION)
+    if img is None:
+        return None
+
+    scale = max_dimension / max(img.shape[:2])
+    if scale < 1:
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    if not ok:
+        return None
+    return base64.b64encode(encoded).decode('ascii')
+
+# ImageFile.LOAD_TRUNCATED_IMAGES is process-wide, so it is only switched on
+# while at least one Pillow encode is running and restored afterwards
+_truncated_lock = threading.Lock()
+_truncated_users = 0
+_truncated_saved = False
+
+@contextmanager
+def _load_truncated_images():
+    """Let Pillow decode what is there of truncated files inside the block.
+
+    Slightly truncated files (common with interrupted copies) then encode here
+    instead of failing over to the much slower convert/ffmpeg paths.
+    """
+    global _truncated_users, _truncated_saved
+    with _truncated_lock:
+        if _truncated_users == 0:
+            _truncated_saved = ImageFile.LOAD_TRUNCATED_IMAGES
+            ImageFile.LOAD_TRUNCATED_IMAGES = True
+        _truncated_users += 1
+    try:
+        yield
+    finally:
+        with _truncated_lock:
+            _truncated_users -= 1
+            if _truncated_users == 0:
+                ImageFile.LOAD_TRUNCATED_IMAGES = _truncated_saved
+
 def encode_image_to_base64_pillow(image_path):
     """Convert image to base64 using Pillow (primary method)."""
     try:
         image_path = Path(image_path)
         ext = image_path.suffix.lower()
         
-        # Early validation - check if file can be opened as an image
+        cfg = load_config()
+        max_dimension = int(cfg.get("llm_max_dimension", 1024))
+
+        if ext in ('.heic', '.heif') and not HEIC_SUPPORT:
+            logging.error(f"HEIC support not available for {image_path}")
+            return None
+
+        # A single open serves both validation and processing, so the header
+        # (expensive for HEIC) is only parsed once
         try:
-            with Image.open(image_path) as test_img:
-                actual_format = test_img.format
-                if not actual_format:
-                    logging.error(f"File {image_path} is not a valid image format")
-                    return None
+            img = Image.open(image_path)
         except Exception as e:
             logging.error(f"Cannot open {image_path} as image: {e}")
             return None
-        
-        # Special handling for potentially problematic HEIC files
-        if ext in ('.heic', '.heif'):
-            if not HEIC_SUPPORT:
-                logging.error(f"HEIC support not available for {image_path}")
+
+        with img, _load_truncated_images():
+            if not img.format:
+                logging.error(f"File {image_path} is not a valid image format")
                 return None
+
+            # A JPEG that is already small enough is sent as-is: decoding and
+            # re-encoding it would only cost time and quality.
+            if (passthrough := _jpeg_passthrough(image_path, img, max_dimension)):
+                return passthrough
+
+            # Catch misnamed files
+            if ext in ('.heic', '.heif') and img.format not in ('HEIF', 'AVIF'):
+                logging.warning(f"File {image_path} has .heic extension but is actually {img.format}")
+
+            if img.format == 'JPEG' and max(img.size) > max_dimension:
+                # Let libjpeg decode at 1/2, 1/4 or 1/8 scale (still >= the target
+                # size) instead of decoding every pixel only to throw most away
+                img.draft(None, (max_dimension, max_dimension))
             
-            # Detect actual file format to catch misnamed files
-            actual_format = detect_actual_image_format(image_path)
-            if actual_format and actual_format not in ('heic', 'heif'):
-                logging.warning(f"File {image_path} has .heic extension but is actually {actual_format.upper()}")
-            elif not actual_format:
-                logging.error(f"Invalid or corrupted HEIC file {image_path}")
-                return None
-        
-        # Open and process the image
-        with Image.open(image_path) as img:
+            if img.mode == 'P':
+                # Palette images only resize with NEAREST, so expand them first
+                # (fixes GIF issue); transparent palettes keep their alpha
+                img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+
+            # Resize before any compositing so that only the small image is touched
+            if max(img.size) > max_dimension:
+                # BILINEAR is several times cheaper and makes no difference to the model
+                resample = Image.Resampling.BILINEAR if cfg.get("fast_resize") else Image.Resampling.LANCZOS
+                img.thumbnail((max_dimension, max_dimension), resample)
+                logging.info(f"Resized large image {image_path} for processing")
+
             # Handle different color modes
             if img.mode in ('RGBA', 'LA'):
-                # Convert transparency to white background
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'RGBA':
-                    background.paste(img, mask=img.split()[-1])
-                else:  # LA mode
-                    background.paste(img, mask=img.split()[-1])
-                img = background
-            elif img.mode == 'P':
-                # Convert palette mode to RGB (fixes GIF issue)
-                img = img.convert('RGB')
+                alpha = img.getchannel('A')
+                if alpha.getextrema()[0] == 255:
+                    # Fully opaque: nothing to composite
+                    img = img.convert('RGB' if img.mode == 'RGBA' else 'L')
+                else:
+                    # Convert transparency to white background
+                    background = Image.new('RGB', img.size, (255, 255, 255))
+                    background.paste(img, mask=alpha)
+                    img = background
             elif img.mode not in ('RGB', 'L'):
                 # Convert any other mode to RGB
                 img = img.convert('RGB')
             
-            # Resize for LLM payload efficiency
-            cfg = load_config()
-            max_dimension = int(cfg.get("llm_max_dimension", 1024))
-            if max(img.size) > max_dimension:
-                img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
-                logging.info(f"Resized large image {image_path} for processing")
-            
             # Convert to JPEG bytes
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format='JPEG', quality=85)
-            img_byte_arr = img_byte_arr.getvalue()
-            return base64.b64encode(img_byte_arr).decode('utf-8')
+            if SIMPLEJPEG_AVAILABLE:
+                if img.mode == 'L':
+                    pixels = np.asarray(img)[:, :, None]
+                    img_byte_arr = simplejpeg.encode_jpeg(pixels, quality=85, colorspace='GRAY')
+                else:
+                    img_byte_arr = simplejpeg.encode_jpeg(np.asarray(img), quality=85, colorspace='RGB')
+            else:
+                img_byte_arr = io.BytesIO()
+                # Single baseline pass: no Huffman optimisation or progressive scans
+                img.save(img_byte_arr, format='JPEG', quality=85,
+                         optimize=False, progressive=False, subsampling='4:2:0')
+                # getbuffer() is a view over the BytesIO, so no extra copy of the JPEG
+                img_byte_arr = img_byte_arr.getbuffer()
+            return base64.b64encode(img_byte_arr).decode('ascii')
             
     except Exception as e:
         ext = image_path.suffix.lower()
@@ -339,7 +849,7 @@ def encode_image_to_base64_convert(image_path):
         
         result = subprocess.run(cmd, capture_output=True, check=True)
         if result.returncode == 0:
-            return base64.b64encode(result.stdout).decode('utf-8')
+            return base64.b64encode(result.stdout).decode('ascii')
         else:
             logging.error(f"ImageMagick convert failed: {result.stderr}")
             return None
@@ -366,7 +876,7 @@ def encode_image_to_base64_ffmpeg(image_path):
         
         result = subprocess.run(cmd, capture_output=True, check=True)
         if result.returncode == 0:
-            return base64.b64encode(result.stdout).decode('utf-8')
+            return base64.b64encode(result.stdout).decode('ascii')
         else:
             logging.error(f"FFmpeg failed: {result.stderr}")
             return None
@@ -378,15 +888,29 @@ def encode_image_to_base64_ffmpeg(image_path):
         logging.error("FFmpeg not found. Install with: apt install ffmpeg")
         return None
 
+ENCODERS = {
+    "opencv": encode_image_to_base64_opencv,
+    "pillow": encode_image_to_base64_pillow,
+    "convert": encode_image_to_base64_convert,
+    "ffmpeg": encode_image_to_base64_ffmpeg,
+}
+
+# Primary methods per extension, tried in order; anything else uses Pillow only
+PRIMARY_ENCODERS = {
+    ext: ("opencv", "pillow") if OPENCV_AVAILABLE else ("pillow",)
+    for ext in _OPENCV_EXTENSIONS
+}
+
 def encode_image_to_base64(image_path):
     """Convert image to base64 string with multiple fallback methods."""
     config = load_config()
     enable_fallbacks = config.get("enable_fallback_methods", True)
     
-    # Try primary method (Pillow)
-    result = encode_image_to_base64_fallback(image_path, "pillow")
-    if result:
-        return result
+    # Try the primary methods for this format
+    for method in PRIMARY_ENCODERS.get(Path(image_path).suffix.lower(), ("pillow",)):
+        result = encode_image_to_base64_fallback(image_path, method)
+        if result:
+            return result
     
     if not enable_fallbacks:
         return None
@@ -404,39 +928,128 @@ def encode_image_to_base64(image_path):
     logging.error(f"All encoding methods failed for {image_path}")
     return None
 
+# Text fields searched by get_metadata_text_exiftool / iter_search_images
+METADATA_TEXT_TAGS = (
+    "-UserComment",
+    "-ImageDescription",
+    "-XPKeywords",
+    "-IPTC:Keywords",
+    "-XMP-dc:Subject",
+    "-XMP-dc:Description",
+)
+
+# Files read per exiftool call when searching, and batches read at once
+SEARCH_BATCH_SIZE = 200
+SEARCH_WORKERS = 4
+
+# Formats whose EXIF block Pillow parses along with the header
+_PILLOW_EXIF_FORMATS = frozenset(('JPEG', 'MPO', 'TIFF'))
+
+def _exif_ascii_text(value):
+    """Decode an EXIF ASCII value as UTF-8, which is what exiftool writes.
+
+    Pillow returns such values decoded as latin-1 ("près" comes back as
+    "prã¨s"), so the original bytes are recovered and decoded again.
+    """
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    try:
+        return str(value).encode('latin-1').decode('utf-8', 'replace')
+    except UnicodeEncodeError:
+        return str(value)
+
+def get_metadata_text_pillow(file_path):
+    """
+    Read the EXIF description and keywords this tool writes in-process, without
+    starting exiftool. Returns "" unless both ImageDescription and XPKeywords
+    are present, so files tagged elsewhere (IPTC/XMP only) still go to exiftool.
+    """
+    try:
+        with Image.open(file_path) as img:
+            if img.format not in _PILLOW_EXIF_FORMATS:
+                return ""
+            exif = img.getexif()
+            description = exif.get(0x010E)  # ImageDescription
+            keywords = exif.get(0x9C9E)  # XPKeywords, UTF-16LE
+            if not description or not keywords:
+                return ""
+            if isinstance(keywords, bytes):
+                keywords = keywords.decode('utf-16-le', 'ignore').rstrip('\x00')
+            parts = [_exif_ascii_text(description), str(keywords)]
+            comment = exif.get_ifd(0x8769).get(0x9286)  # UserComment
+            if isinstance(comment, bytes):
+                # 8-byte character code prefix, then the text; UNICODE is
+                # UCS-2 in the byte order of the EXIF block itself
+                if comment.startswith(b'UNICODE'):
+                    encoding = 'utf-16-be' if exif.endian == '>' else 'utf-16-le'
+                else:
+                    encoding = 'latin-1'
+                comment = comment[8:].decode(encoding, 'ignore').rstrip('\x00 ')
+            if comment:
+                parts.append(str(comment))
+            return "\n".join(parts).lower()
+    except Exception:
+        return ""
+
 def get_metadata_text_exiftool(file_path):
     """
     Use exiftool to extract text metadata from a file.
     Returns a lowercase string containing all text metadata
     fields concatenated together for easy searching.
+    Files carrying this tool's EXIF fields are read in-process instead.
+    """
+    # One-file batch: JSON values only, so tag names such as "Keywords"
+    # are never part of the searched text
+    return get_metadata_texts_exiftool([file_path]).get(str(file_path), "")
+
+def get_metadata_texts_exiftool(file_paths):
     """
+    Batch form of get_metadata_text_exiftool: reads many files in one exiftool call
+    (after the in-process EXIF read, so only files it cannot answer are passed).
+    Returns a dict of path string -> lowercase metadata text. Files exiftool
+    could not read are left out.
+    """
+    texts = {}
+    remaining = []
+    for path in map(str, file_paths):
+        if text := get_metadata_text_pillow(path):
+            texts[path] = text
+        else:
+            remaining.append(path)
+    if not remaining:
+        return texts
     try:
         cfg = load_config()
-        timeout_s = int(cfg.get("exiftool_timeout_seconds", 60))
-        cmd = [
-            "exiftool", "-s",
-            "-UserComment",
-            "-ImageDescription",
-            "-XPKeywords",
-            "-IPTC:Keywords",
-            "-XMP-dc:Subject",
-            "-XMP-dc:Description",
-            str(file_path)
-        ]
-        rc, out, err = run_cmd_with_timeout(cmd, timeout_seconds=timeout_s)
-        if rc == 0 and out is not None:
-            return out.lower()
-        else:
-            logging.error(f"Exiftool error: {err}")
-            return ""
+        # Scale the per-file timeout so a full batch is not cut short
+        timeout_s = int(cfg.get("exiftool_timeout_seconds", 60)) * max(1, len(remaining) // 20)
+        cmd = ["exiftool", "-j", *METADATA_TEXT_TAGS, *remaining]
+        rc, out, err = run_exiftool(cmd, timeout_seconds=timeout_s)
+        # exiftool exits non-zero if any one file failed; the rest are still in the output
+        if not out or not out.strip():
+            if err:
+                logging.error(f"Exiftool error: {err}")
+            return texts
+        for entry in json_loads(out):
+            source = entry.pop("SourceFile", None)
+            if source is None:
+                continue
+            parts = []
+            for value in entry.values():
+                if isinstance(value, list):
+                    parts.extend(str(v) for v in value)
+                else:
+                    parts.append(str(value))
+            texts[source] = "\n".join(parts).lower()
+        return texts
     except Exception as e:
         logging.error(f"Error getting metadata: {e}")
-        return ""
+        return texts
 
-def is_image_already_processed_in_db(image_path, db_session=None):
+def is_image_already_processed_in_db(image_path, db_session=None, stat_result=None):
     """
     Check if image is already processed in the database.
     This is the primary method for deduplication.
+    stat_result, if the caller already has one, saves a stat call.
     """
     try:
         # If no db_session provided, we can't check the database
@@ -455,7 +1068,8 @@ def is_image_already_processed_in_db(image_path, db_session=None):
             
             # Check if file modification time has changed (indicating file was updated)
             try:
-                current_mtime = datetime.fromtimestamp(image_path.stat().st_mtime)
+                st = stat_result or image_path.stat()
+                current_mtime = datetime.fromtimestamp(st.st_mtime)
                 if existing_image.file_modified_at and current_mtime > existing_image.file_modified_at:
                     logging.info(f"File modified since last processing: {image_path}")
                     return False  # File was modified, should reprocess
@@ -468,28 +1082,264 @@ def is_image_already_processed_in_db(image_path, db_session=None):
         logging.error(f"Error checking database for {image_path}: {e}")
         return False
 
-def is_file_processed(image_path):
-    """Checks if a file has already been processed by checking its checksum in the database."""
+# The tracker is a small SQLite table (one row per path) at tracking_sqlite_path,
+# in the app's data directory by default. Each lookup is a primary-key query,
+# so it costs the same for ten files as for a million and always sees what
+# other processes (e.g. the web UI and the CLI at once) have committed. Size
+# and mtime_ns are kept next to the checksum so an unchanged file is
+# recognised from a stat alone.
+#
+# tracking_db_path is the older "{path}:{checksum}" text tracker, which the
+# standalone CLI installed by image-tagger-install.sh still appends to. It is
+# only read here: its entries are imported whenever it has changed. If the
+# SQLite database cannot be written, the text tracker is used directly instead,
+# appending lines exactly as the CLI does.
+_processed_lock = threading.Lock()
+_tracker_conn = None
+_tracker_conn_path = None
+# SQLite path that could not be opened for writing; the text tracker stands in
+_tracker_failed_path = None
+# ((path, size, mtime_ns), {path: checksum}) of the text tracker in fallback mode
+_legacy_cache = (None, {})
+
+# mark_file_as_processed queues rows here (path -> row). Inside tracker_batch()
+# they are written every TRACKER_FLUSH_EVERY rows and when the batch ends;
+# outside of one each row is written straight away. Writes are short
+# transactions so other processes using the tracker are never locked out for long.
+TRACKER_FLUSH_EVERY = 50
+_tracker_pending = {}
+_tracker_batches = 0
+
+_SQLITE_HEADER = b"SQLite format 3\x00"
+
+def _read_legacy_tracker(db_path):
+    """Rows from a "{path}:{checksum}[\\t{size}\\t{mtime_ns}]" text tracker, or None."""
+    try:
+        with open(db_path, 'rb') as f:
+            header = f.read(len(_SQLITE_HEADER))
+    except FileNotFoundError:
+        return None
+    if not header or header == _SQLITE_HEADER:
+        return None
+    rows = {}
+    with open(db_path, 'r', errors='replace') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            size = mtime_ns = None
+            parts = line.rsplit('\t', 2)
+            if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+                line, size, mtime_ns = parts[0], int(parts[1]), int(parts[2])
+            path, sep, checksum = line.strip().rpartition(':')
+            if sep and path:
+                rows[path] = (path, checksum, size, mtime_ns)
+    return list(rows.values())
+
+def _import_legacy_tracker(conn, legacy_path):
+    """Copy the text tracker's entries into the table if it changed since the last import."""
+    try:
+        st = legacy_path.stat()
+    except OSError:
+        return
+    key = str(legacy_path)
+    if conn.execute("SELECT size, mtime_ns FROM legacy_import WHERE path = ?",
+                    (key,)).fetchone() == (st.st_size, st.st_mtime_ns):
+        return
+    try:
+        rows = _read_legacy_tracker(legacy_path) or []
+    except OSError as e:
+        logging.warning(f"Cannot read text tracker {legacy_path}: {e}")
+        return
+    # Rows already in the table were written with size and mtime, so they win
+    conn.executemany("INSERT OR IGNORE INTO processed VALUES (?, ?, ?, ?)", rows)
+    conn.execute("INSERT OR REPLACE INTO legacy_import VALUES (?, ?, ?)",
+                 (key, st.st_size, st.st_mtime_ns))
+    if rows:
+        logging.info(f"Imported {len(rows)} entries from text tracker {legacy_path}")
+
+def _tracker_connection(db_path):
+    """Open the tracking database, or return None if it can't be written. Caller holds the lock."""
+    global _tracker_conn, _tracker_conn_path, _tracker_failed_path
+    # An open connection is trusted as is: no stat of the database per lookup or write
+    if _tracker_conn is not None and _tracker_conn_path == db_path:
+        return _tracker_conn
+    if _tracker_failed_path == db_path:
+        return None
+    _close_tracker()
+    conn = None
+    try:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed ("
+            "path TEXT PRIMARY KEY, checksum TEXT NOT NULL, size INTEGER, mtime_ns INTEGER"
+            ") WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS legacy_import ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER)"
+        )
+        # A real write, so a database we can only read is caught here and not per call
+        conn.execute("PRAGMA user_version = 1")
+        _import_legacy_tracker(conn, get_processed_db_path())
+        conn.commit()
+    except (OSError, sqlite3.Error) as e:
+        if conn is not None:
+            conn.close()
+        logging.warning(f"Cannot write tracking database {db_path} ({e}); "
+                        f"using the text tracker at {get_processed_db_path()}")
+        _tracker_failed_path = db_path
+        return None
+    _tracker_conn, _tracker_conn_path = conn, db_path
+    return conn
+
+def _legacy_entries(legacy_path):
+    """{path: checksum} from the text tracker, re-read when it changes. Caller holds the lock."""
+    global _legacy_cache
+    try:
+        st = legacy_path.stat()
+    except FileNotFoundError:
+        return {}
+    key = (legacy_path, st.st_size, st.st_mtime_ns)
+    if _legacy_cache[0] != key:
+        rows = _read_legacy_tracker(legacy_path) or []
+        _legacy_cache = (key, {path: checksum for path, checksum, _, _ in rows})
+    return _legacy_cache[1]
+
+def _lookup_processed(db_path, path):
+    """Return (checksum, size, mtime_ns) for path, or None if untracked. Caller holds the lock."""
+    row = _tracker_pending.get(path)
+    if row is not None:
+        return row[1:]
+    conn = _tracker_connection(db_path)
+    if conn is None:
+        checksum = _legacy_entries(get_processed_db_path()).get(path)
+        return None if checksum is None else (checksum, None, None)
+    return conn.execute(
+        "SELECT checksum, size, mtime_ns FROM processed WHERE path = ?", (path,)
+    ).fetchone()
+
+def _flush_tracker():
+    """Write queued rows in one transaction. Caller holds the lock."""
+    if not _tracker_pending:
+        return
+    try:
+        conn = _tracker_connection(_tracker_conn_path or get_tracker_db_path())
+        if conn is None:
+            # Same line format the standalone CLI appends
+            legacy_path = get_processed_db_path()
+            legacy_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(legacy_path, 'a') as f:
+                f.writelines(f"{path}:{checksum}\n" for path, checksum, _, _ in _tracker_pending.values())
+        else:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?)", _tracker_pending.values())
+        _tracker_pending.clear()
+    except (OSError, sqlite3.Error) as e:
+        logging.error(f"Error writing to processed file DB: {e}")
+
+def _close_tracker():
+    """Close the connection. Caller holds the lock."""
+    global _tracker_conn, _tracker_conn_path
+    if _tracker_conn is not None:
+        try:
+            _tracker_conn.close()
+        except sqlite3.Error:
+            pass
+        _tracker_conn = _tracker_conn_path = None
+
+def flush_processed_db():
+    """Write out any tracker entries queued by mark_file_as_processed."""
+    with _processed_lock:
+        _flush_tracker()
+
+@contextmanager
+def tracker_batch():
+    """Queue mark_file_as_processed writes until the block ends."""
+    global _tracker_batches
+    with _processed_lock:
+        _tracker_batches += 1
+    try:
+        yield
+    finally:
+        with _processed_lock:
+            _tracker_batches -= 1
+            _flush_tracker()
+
+def _shutdown_tracker():
+    with _processed_lock:
+        _flush_tracker()
+        _close_tracker()
+
+atexit.register(_shutdown_tracker)
+
+def is_file_processed(image_path, stat_result=None):
+    """Checks if a file has already been processed by checking its checksum in the database.
+
+    stat_result, if the caller already has one, saves a stat call.
+    """
     config = load_config()
     if not config.get("use_file_tracking", True):
         return False  # Skip tracking if disabled in config
         
-    db_path = get_processed_db_path()
-    if not db_path.exists():
+    db_path = get_tracker_db_path()
+    try:
+        st = stat_result or os.stat(image_path)
+    except OSError:
         return False
 
-    checksum = get_file_checksum(image_path)
-    if not checksum:
+    try:
+        with _processed_lock:
+            known = _lookup_processed(db_path, str(image_path))
+    except (OSError, sqlite3.Error) as e:
+        logging.error(f"Error reading processed file DB: {e}")
+        return False
+    if known is None:
         return False
+    known_checksum, size, mtime_ns = known
 
+    # Fast path: same size and mtime as when it was marked means no need to hash it
+    if size == st.st_size and mtime_ns == st.st_mtime_ns:
+        return True
+
+    checksum = get_file_checksum(image_path, config.get("checksum_algo", "sha256"),
+                                 int(config.get("checksum_max_bytes") or 0))
+    return bool(checksum) and checksum == known_checksum
+
+def tracked_unchanged(stats):
+    """Return the paths in stats (path -> os.stat_result) whose tracker row has the same size and mtime.
+
+    Answers is_file_processed's stat-only fast path for a whole batch in a few
+    queries, so unchanged files can be skipped without going through process_image.
+    """
+    config = load_config()
+    if not stats or not config.get("use_file_tracking", True):
+        return set()
+    db_path = get_tracker_db_path()
+    by_name = {str(path): path for path in stats}
+    names = list(by_name)
+    unchanged = set()
     try:
-        with open(db_path, 'r') as f:
-            for line in f:
-                if line.strip() == f"{image_path}:{checksum}":
-                    return True
-    except IOError as e:
+        with _processed_lock:
+            _flush_tracker()
+            conn = _tracker_connection(db_path)
+            if conn is None:
+                return set()  # the text tracker has no sizes or mtimes
+            # Stay under SQLite's default limit of 999 bound parameters
+            for start in range(0, len(names), 900):
+                chunk = names[start:start + 900]
+                rows = conn.execute(
+                    f"SELECT path, size, mtime_ns FROM processed WHERE path IN ({','.join('?' * len(chunk))})",
+                    chunk)
+                for name, size, mtime_ns in rows:
+                    st = stats[by_name[name]]
+                    if size == st.st_size and mtime_ns == st.st_mtime_ns:
+                        unchanged.add(by_name[name])
+    except (OSError, sqlite3.Error) as e:
         logging.error(f"Error reading processed file DB: {e}")
-    return False
+        return set()
+    return unchanged
 
 def mark_file_as_processed(image_path):
     """Adds a file and its checksum to the processed database."""
@@ -497,17 +1347,24 @@ def mark_file_as_processed(image_path):
     if not config.get("use_file_tracking", True):
         return  # Skip tracking if disabled in config
         
-    checksum = get_file_checksum(image_path)
+    try:
+        st = os.stat(image_path)
+    except OSError:
+        return
+    checksum = get_file_checksum(image_path, config.get("checksum_algo", "sha256"),
+                                 int(config.get("checksum_max_bytes") or 0))
     if not checksum:
         return
 
-    db_path = get_processed_db_path()
+    db_path = get_tracker_db_path()
     try:
-        # Ensure directory exists
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(db_path, 'a') as f:
-            f.write(f"{image_path}:{checksum}\n")
-    except IOError as e:
+        row = (str(image_path), checksum, st.st_size, st.st_mtime_ns)
+        with _processed_lock:
+            _tracker_connection(db_path)
+            _tracker_pending[row[0]] = row
+            if not _tracker_batches or len(_tracker_pending) >= TRACKER_FLUSH_EVERY:
+                _flush_tracker()
+    except (OSError, sqlite3.Error) as e:
         logging.error(f"Error writing to processed file DB: {e}")
     # Best-effort: update DB checksum if models available
     try:
@@ -523,7 +1380,8 @@ def mark_file_as_processed(image_path):
     except Exception:
         pass
 
-def update_image_processing_status(image_path, status, error_message=None, db_session=None):
+def update_image_processing_status(image_path, status, error_message=None, db_session=None,
+                                  stat_result=None, commit=True):
     """
     Update the processing status of an image in the database.
     
@@ -532,6 +1390,9 @@ def update_image_processing_status(image_path, status, error_message=None, db_se
         status: Processing status (pending, processing, completed, failed, skipped)
         error_message: Error message if status is failed
         db_session: Database session
+        stat_result: The file's os.stat() result, if the caller already has a current one
+        commit: Commit straight away; False leaves the change in the session for
+            the caller's next commit
     """
     try:
         if db_session is None:
@@ -550,13 +1411,14 @@ def update_image_processing_status(image_path, status, error_message=None, db_se
             
             # Update file metadata if available
             try:
-                stat = image_path.stat()
+                stat = stat_result or image_path.stat()
                 image.file_modified_at = datetime.fromtimestamp(stat.st_mtime)
                 image.file_size = stat.st_size
             except Exception as e:
                 logging.warning(f"Could not update file metadata for {image_path}: {e}")
             
-            db_session.commit()
+            if commit:
+                db_session.commit()
             logging.debug(f"Updated processing status for {image_path}: {status}")
         
     except Exception as e:
@@ -565,7 +1427,8 @@ def update_image_processing_status(image_path, status, error_message=None, db_se
             db_session.rollback()
 
 def process_image(image_path, server, model, quiet=False, is_override=False, 
-                 ollama_restart_cmd=None, restart_on_failure=False, return_data=False, db_session=None):
+                 ollama_restart_cmd=None, restart_on_failure=False, return_data=False, db_session=None,
+                 base64_image=None, on_dispatch=None, stat_result=None):
     """Process a single image with the vision model and update its metadata.
     
     Args:
@@ -577,7 +1440,14 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
         ollama_restart_cmd: Command to restart Ollama (if needed)
         restart_on_failure: Whether to restart Ollama on certain failures
         return_data: Whether to return the description and tags instead of just True/False
-        db_session: Database session for checking processing status
+        db_session: Database session for checking processing status. The final
+            "completed"/"skipped" status is left uncommitted, to be committed by the
+            caller together with the description and tags it stores
+        base64_image: Already-encoded image data, if the caller prepared it ahead of time
+        on_dispatch: Called once the image passed the skip checks, just before the model
+            request; lets process_directory start preparing the next image meanwhile
+        stat_result: os.stat() result from the directory scan, reused until the
+            metadata is written instead of statting the file again
         
     Returns:
         If return_data is False:
@@ -600,15 +1470,15 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
         metadata_max_retries = config.get("metadata_max_retries", 5)
         max_file_size_mb = config.get("max_file_size_mb", 50)
         
-        # Update processing status to "processing"
-        update_image_processing_status(image_path, "processing", db_session=db_session)
-        
         # Check file size
         try:
-            file_size_mb = image_path.stat().st_size / (1024 * 1024)
+            st = stat_result or image_path.stat()
+            # Update processing status to "processing"
+            update_image_processing_status(image_path, "processing", db_session=db_session, stat_result=st)
+            file_size_mb = st.st_size / (1024 * 1024)
             if file_size_mb > max_file_size_mb:
                 error_msg = f"File too large ({file_size_mb:.1f}MB > {max_file_size_mb}MB)"
-                update_image_processing_status(image_path, "failed", error_msg, db_session=db_session)
+                update_image_processing_status(image_path, "failed", error_msg, db_session=db_session, stat_result=st)
                 logging.warning(f"{error_msg}: {image_path}")
                 return (False, None) if return_data else False
         except Exception as e:
@@ -620,24 +1490,27 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
         # Check if already processed (database check first, then file tracking)
         if not is_override:
             # Primary check: database
-            if is_image_already_processed_in_db(image_path, db_session):
-                update_image_processing_status(image_path, "skipped", db_session=db_session)
+            if is_image_already_processed_in_db(image_path, db_session, stat_result=st):
+                update_image_processing_status(image_path, "skipped", db_session=db_session, stat_result=st,
+                                               commit=False)
                 if not quiet:
                     logging.info(f"🔄 Skipping already processed file (database): {image_path}")
                 return ("skipped", None) if return_data else "skipped"
             
             # Secondary check: file tracking
-            if is_file_processed(image_path):
-                update_image_processing_status(image_path, "skipped", db_session=db_session)
+            if is_file_processed(image_path, stat_result=st):
+                update_image_processing_status(image_path, "skipped", db_session=db_session, stat_result=st,
+                                               commit=False)
                 if not quiet:
                     logging.info(f"🔄 Skipping already processed file (tracking): {image_path}")
                 return ("skipped", None) if return_data else "skipped"
         
         # Get Base64 encoded image with fallback methods
-        base64_image = encode_image_to_base64(image_path)
+        if not base64_image:
+            base64_image = encode_image_to_base64(image_path)
         if not base64_image:
             error_msg = "Failed to encode image"
-            update_image_processing_status(image_path, "failed", error_msg, db_session=db_session)
+            update_image_processing_status(image_path, "failed", error_msg, db_session=db_session, stat_result=st)
             logging.error(f"❌ {error_msg}: {image_path}")
             return (False, None) if return_data else False
         
@@ -656,6 +1529,34 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
             "Return only the JSON object, no markdown, no code fences, no extra text."
         )
 
+        if on_dispatch is not None:
+            on_dispatch()
+
+        def finish(description, tags):
+            """Store a parsed reply: write the metadata, mark the file and return the result."""
+            if not description:
+                raise ValueError("Empty description received")
+            if not tags:
+                tags = normalize_tags(extract_tags_from_description(description))
+
+            # Strip any JSON wrapper that leaked through
+            description = clean_description(description)
+
+            if not quiet:
+                logging.info(f"✅ Generated description for {image_path}")
+                logging.info(f"📝 Description: {description}")
+                logging.info(f"🏷️ Tags: {', '.join(tags)}")
+
+            # Update image metadata; a failed write still counts, as the DB has the result
+            warning_msg = None
+            if not update_image_metadata(image_path, description, tags, is_override, metadata_max_retries):
+                warning_msg = "Metadata write failed; description/tags saved in DB only"
+                logging.warning(f"⚠️ {warning_msg} for {image_path}")
+            mark_file_as_processed(image_path)
+            update_image_processing_status(image_path, "completed", warning_msg, db_session=db_session,
+                                           commit=False)
+            return (description, tags) if return_data else True
+
         for attempt in range(max_retries):
             # Respect schedule window and cancel requests between retry attempts
             try:
@@ -681,13 +1582,15 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
                 if api_type == 'openai':
                     # --- OpenAI-compatible endpoint (llama.cpp, LM Studio, etc.) ---
                     url = f"{server}/v1/chat/completions"
-                    if attempt == 0:
+                    health_url = f"{server}/v1/models"
+                    if attempt == 0 and not _recently_healthy(health_url):
                         try:
-                            health = requests.get(f"{server}/v1/models", timeout=8)
+                            health = http_session.get(health_url, timeout=8)
                             if health.status_code >= 500:
                                 raise requests.exceptions.RequestException(
                                     f"OpenAI-compatible health check failed with status {health.status_code}"
                                 )
+                            _mark_health(health_url, True)
                         except requests.exceptions.RequestException as e:
                             logging.error(f"OpenAI-compatible server is not available: {e}")
                             if attempt == max_retries - 1:
@@ -711,73 +1614,17 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
                         "max_tokens": max_output_tokens
                     }
                     logging.info(f"Sending OpenAI-compatible request to: {url}")
-                    response = requests.post(url, json=payload, timeout=300)
+                    response = http_session.post(url, json=payload, timeout=300)
 
                     if response.status_code == 200:
                         try:
-                            response_json = response.json()
+                            response_json = json_loads(response.content)
                             content = (response_json.get("choices", [{}])[0]
                                        .get("message", {})
                                        .get("content", "")).strip()
                             if not content:
                                 raise ValueError("Empty response from API")
-
-                            # Try to parse as JSON
-                            description = None
-                            tags = None
-                            # Strip markdown code fences if present
-                            cleaned = content.strip()
-                            if cleaned.startswith('```'):
-                                lines = cleaned.split('\n')
-                                # Remove first line (```json) and last line (```)
-                                lines = [l for l in lines if not l.strip().startswith('```')]
-                                cleaned = '\n'.join(lines).strip()
-                            try:
-                                inner = json.loads(cleaned)
-                                if isinstance(inner, dict):
-                                    description = (inner.get('description') or '').strip() or None
-                                    tags = normalize_tags(inner.get('tags') or [])
-                            except Exception:
-                                # If JSON parse fails, try to extract description with regex
-                                desc_match = re.search(r'"description"\s*:\s*"((?:[^"\\]|\\.)*)\s*"', cleaned)
-                                if desc_match:
-                                    description = desc_match.group(1).strip()
-                                tags_match = re.search(r'"tags"\s*:\s*\[(.*?)\]', cleaned, re.DOTALL)
-                                if tags_match:
-                                    tag_str = tags_match.group(1)
-                                    tags = [t.strip().strip('"').strip("'") for t in tag_str.split(',') if t.strip().strip('"').strip("'")]
-                                    tags = normalize_tags(tags)
-                                if not description:
-                                    description = content
-
-                            if not description:
-                                raise ValueError("Empty description received")
-                            if tags is None or len(tags) == 0:
-                                tags = normalize_tags(extract_tags_from_description(description))
-
-                            # Strip any JSON wrapper that leaked through
-                            description = clean_description(description)
-
-                            if not quiet:
-                                logging.info(f"✅ Generated description for {image_path}")
-                                logging.info(f"📝 Description: {description}")
-                                logging.info(f"🏷️ Tags: {', '.join(tags)}")
-
-                            result = update_image_metadata(image_path, description, tags, is_override, metadata_max_retries)
-                            if result:
-                                mark_file_as_processed(image_path)
-                                update_image_processing_status(image_path, "completed", db_session=db_session)
-                                if return_data:
-                                    return (description, tags)
-                                return True
-                            else:
-                                warning_msg = "Metadata write failed; description/tags saved in DB only"
-                                mark_file_as_processed(image_path)
-                                update_image_processing_status(image_path, "completed", warning_msg, db_session=db_session)
-                                logging.warning(f"⚠️ {warning_msg} for {image_path}")
-                                if return_data:
-                                    return (description, tags)
-                                return True
+                            return finish(*parse_reply_content(content))
 
                         except Exception as e:
                             logging.error(f"Error processing OpenAI API response: {e}")
@@ -785,7 +1632,7 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
                     else:
                         error_msg = f"API error (HTTP {response.status_code})"
                         try:
-                            error_json = response.json()
+                            error_json = json_loads(response.content)
                             if 'error' in error_json:
                                 if isinstance(error_json['error'], dict):
                                     error_msg = f"API error: {error_json['error'].get('message', str(error_json['error']))}"
@@ -801,19 +1648,22 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
                 else:
                     # --- Ollama native endpoint ---
                     # Check if Ollama server is available
+                    health_url = f"{server}/api/tags"
                     try:
-                        logging.info(f"🔧 DEBUG: Health check to server: {server}")
-                        health_check = requests.get(f"{server}/api/tags", timeout=5)
-                        if health_check.status_code != 200:
-                            logging.error(f"Ollama server health check failed with status code: {health_check.status_code}")
-                            if attempt == max_retries - 1:
-                                error_msg = f"Ollama server health check failed: {health_check.status_code}"
-                                update_image_processing_status(image_path, "failed", error_msg, db_session=db_session)
-                                if return_data:
-                                    return (False, None)
-                                return False
-                            time.sleep(5)
-                            continue
+                        if not _recently_healthy(health_url):
+                            logging.info(f"🔧 DEBUG: Health check to server: {server}")
+                            health_check = http_session.get(health_url, timeout=5)
+                            if health_check.status_code != 200:
+                                logging.error(f"Ollama server health check failed with status code: {health_check.status_code}")
+                                if attempt == max_retries - 1:
+                                    error_msg = f"Ollama server health check failed: {health_check.status_code}"
+                                    update_image_processing_status(image_path, "failed", error_msg, db_session=db_session)
+                                    if return_data:
+                                        return (False, None)
+                                    return False
+                                time.sleep(5)
+                                continue
+                            _mark_health(health_url, True)
                     except requests.exceptions.RequestException as e:
                         logging.error(f"Ollama server is not available: {e}")
                         if attempt == max_retries - 1:
@@ -837,76 +1687,22 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
 
                     # DEBUG: Log the exact server URL being used for generation
                     logging.info(f"🔧 DEBUG: Sending generation request to server: {server}")
-                    response = requests.post(f"{server}/api/generate",
+                    response = http_session.post(f"{server}/api/generate",
                                             json=payload,
                                             timeout=300)
 
                     if response.status_code == 200:
                         try:
-                            response_json = response.json()
-                            # Try JSON contract first
-                            description = None
-                            tags = None
+                            response_json = json_loads(response.content)
+                            description = tags = None
                             if isinstance(response_json, dict):
+                                # Try JSON contract first
                                 if 'description' in response_json and isinstance(response_json.get('tags'), list):
                                     description = (response_json.get('description') or '').strip() or None
                                     tags = normalize_tags(response_json.get('tags') or [])
                                 elif 'response' in response_json:
-                                    content = (response_json.get('response') or '').strip()
-                                    # Strip markdown code fences if present
-                                    cleaned = content
-                                    if cleaned.startswith('```'):
-                                        lines = cleaned.split('\n')
-                                        lines = [l for l in lines if not l.strip().startswith('```')]
-                                        cleaned = '\n'.join(lines).strip()
-                                    try:
-                                        inner = json.loads(cleaned)
-                                        if isinstance(inner, dict):
-                                            description = (inner.get('description') or '').strip() or None
-                                            tags = normalize_tags(inner.get('tags') or [])
-                                    except Exception:
-                                        # Try regex extraction as fallback
-                                        desc_match = re.search(r'"description"\s*:\s*"((?:[^"\\]|\\.)*)\s*"', cleaned)
-                                        if desc_match:
-                                            description = desc_match.group(1).strip()
-                                        tags_match = re.search(r'"tags"\s*:\s*\[(.*?)\]', cleaned, re.DOTALL)
-                                        if tags_match:
-                                            tag_str = tags_match.group(1)
-                                            tags = [t.strip().strip('"').strip("'") for t in tag_str.split(',') if t.strip().strip('"').strip("'")]
-                                            tags = normalize_tags(tags)
-                                        if not description:
-                                            description = content
-                            # Final fallback
-                            if not description:
-                                raise ValueError("Empty description received")
-                            if tags is None or len(tags) == 0:
-                                tags = normalize_tags(extract_tags_from_description(description))
-
-                            # Strip any JSON wrapper that leaked through
-                            description = clean_description(description)
-
-                            if not quiet:
-                                logging.info(f"✅ Generated description for {image_path}")
-                                logging.info(f"📝 Description: {description}")
-                                logging.info(f"🏷️ Tags: {', '.join(tags)}")
-
-                            # Update image metadata
-                            result = update_image_metadata(image_path, description, tags, is_override, metadata_max_retries)
-
-                            if result:
-                                mark_file_as_processed(image_path)
-                                update_image_processing_status(image_path, "completed", db_session=db_session)
-                                if return_data:
-                                    return (description, tags)
-                                return True
-                            else:
-                                warning_msg = "Metadata write failed; description/tags saved in DB only"
-                                mark_file_as_processed(image_path)
-                                update_image_processing_status(image_path, "completed", warning_msg, db_session=db_session)
-                                logging.warning(f"⚠️ {warning_msg} for {image_path}")
-                                if return_data:
-                                    return (description, tags)
-                                return True
+                                    description, tags = parse_reply_content(response_json.get('response') or '')
+                            return finish(description, tags)
 
                         except Exception as e:
                             logging.error(f"Error processing API response: {e}")
@@ -914,7 +1710,7 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
                     else:
                         error_msg = f"API error (HTTP {response.status_code})"
                         try:
-                            error_json = response.json()
+                            error_json = json_loads(response.content)
                             if 'error' in error_json:
                                 error_msg = f"API error: {error_json['error']}"
                         except Exception:
@@ -924,6 +1720,7 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
 
             except requests.exceptions.RequestException as e:
                 logging.error(f"Request error on attempt {attempt+1}/{max_retries}: {e}")
+                _forget_health(server)
                 time.sleep(5)
 
         error_msg = f"Failed after {max_retries} attempts"
@@ -937,6 +1734,138 @@ def process_image(image_path, server, model, quiet=False, is_override=False,
         logging.error(f"❌ {error_msg} processing {image_path}")
         return (False, None) if return_data else False
 
+def _process_files(files, threads, server, model, quiet, override, ollama_restart_cmd,
+                   restart_on_failure, return_data, stats=None):
+    """
+    Yield (path, process_image result) for each file, running up to `threads` at once.
+
+    Time per image is dominated by waiting on the model server, so worker threads
+    overlap those waits; the server's own parallelism (e.g. OLLAMA_NUM_PARALLEL)
+    is the practical upper bound. With threads > 1 results arrive in completion order.
+    Tracking-file writes are buffered for the batch and flushed when it finishes.
+    stats optionally maps each path to the os.stat() result from the directory scan.
+    """
+    stats = stats or {}
+
+    def run(path, base64_image=None, on_dispatch=None):
+        return process_image(path, server, model, quiet, override, ollama_restart_cmd,
+                             restart_on_failure, return_data=return_data,
+                             base64_image=base64_image, on_dispatch=on_dispatch,
+                             stat_result=stats.get(path))
+
+    with tracker_batch():
+        yield from _run_files(files, threads, run)
+
+def _run_files(files, threads, run):
+    """Scheduling half of _process_files; run(path, base64_image, on_dispatch) does the work."""
+    if len(files) <= 1:
+        for path in files:
+            yield path, run(path)
+        return
+
+    if threads <= 1:
+        # Ollama has no multi-image batch endpoint (several images in one prompt get
+        # one combined answer), so instead overlap work: while one image is waiting
+        # on the model, encode the next few on helper threads (PIL and hashlib release
+        # the GIL, so threads overlap as well as processes would without pickling the
+        # payloads back). Prefetch only starts once an image is really sent, so runs
+        # that mostly skip don't encode anything.
+        depth = max(1, int(load_config().get("prefetch_depth", 2)))
+        prefetched = {}
+        with ThreadPoolExecutor(max_workers=depth) as encoder:
+            for idx, path in enumerate(files):
+                def prefetch_next(upcoming=files[idx + 1:idx + 1 + depth]):
+                    for next_path in upcoming:
+                        if next_path not in prefetched:
+                            prefetched[next_path] = encoder.submit(encode_image_to_base64, next_path)
+
+                future = prefetched.pop(path, None)
+                base64_image = future.result() if future is not None else None
+                yield path, run(path, base64_image, prefetch_next)
+        return
+
+    # Keep at most two images per worker queued rather than a future for every
+    # file up front: memory stays flat on big folders, and if the caller stops
+    # early only the images already in flight are finished.
+    workers = min(threads, len(files))
+    remaining = iter(files)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(run, path): path for path in islice(remaining, 2 * workers)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                for next_path in islice(remaining, 1):
+                    pending[executor.submit(run, next_path)] = next_path
+                yield path, future.result()
+
+def _dispatch(files, threads, server, model, quiet, override, ollama_restart_cmd,
+              restart_on_failure, return_data, stats=None):
+    """
+    Yield (path, result, data) for each file, with result normalised to True,
+    "skipped" or False. data is the (description, tags) pair when return_data
+    is set and the image was tagged, otherwise None.
+    """
+    for path, outcome in _process_files(files, threads, server, model, quiet, override,
+                                        ollama_restart_cmd, restart_on_failure, return_data, stats):
+        data = None
+        if return_data:
+            result, tags = outcome
+            if result not in (False, None, "skipped"):
+                data, result = (result, tags), True
+        else:
+            result = outcome
+        if result is not True and result != "skipped":
+            result = False
+        yield path, result, data
+
+def _chunked(items, size):
+    """Split items into lists of at most size elements."""
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+IMAGE_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.heic', '.heif', '.tif', '.tiff'))
+
+def scan_files(root, recursive=True, extensions=IMAGE_EXTENSIONS):
+    """Yield os.DirEntry objects for files under root whose lowercase suffix is in extensions.
+
+    Like os.walk, this descends into every subdirectory (hidden ones included)
+    but does not follow symlinked directories.
+
+    Uses os.scandir so the suffix check happens before any stat, and the
+    directory-entry type cached by readdir avoids separate is_file()/is_dir() calls.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError as e:
+            logging.warning(f"Cannot scan directory: {e}")
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                        continue
+                    # str.rfind instead of os.path.splitext: this runs for every entry
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot > 0 and name[dot:].lower() in extensions and entry.is_file():
+                        yield entry
+                except OSError:
+                    continue
+
+def _iter_images(root, recursive=True):
+    """Yield (Path, os.stat_result) for image files under root, as found by scan_files."""
+    for entry in scan_files(root, recursive):
+        try:
+            yield Path(entry.path), entry.stat()
+        except OSError:
+            continue
+
 def process_directory(input_path, server, model, recursive=True, quiet=False, 
                     override=False, ollama_restart_cmd=None, batch_size=0, 
                     batch_delay=5, threads=1, restart_on_failure=False, return_data=False):
@@ -952,8 +1881,8 @@ def process_directory(input_path, server, model, recursive=True, quiet=False,
         override: Force override existing metadata
         ollama_restart_cmd: Command to restart Ollama if needed
         batch_size: Process images in batches of this size (0 = no batching)
-        batch_delay: Seconds to pause between batches
-        threads: Number of threads to use (currently ignored)
+        batch_delay: Minimum seconds from the start of one batch to the next
+        threads: Number of images to process concurrently (1 = sequential)
         restart_on_failure: Whether to restart Ollama on certain failures
         return_data: Whether to return descriptions and tags
         
@@ -963,124 +1892,49 @@ def process_directory(input_path, server, model, recursive=True, quiet=False,
         If return_data is True:
             List of (path, description, tags) tuples for successfully processed images
     """
-    image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.heic', '.heif', '.tif', '.tiff')
-    input_path = Path(input_path)
-
-    # Collect all target files efficiently
-    image_set = set(ext.lower() for ext in image_extensions)
-    image_files = []
-    if recursive:
-        for root, dirs, files in os.walk(input_path):
-            root_path = Path(root)
-            for name in files:
-                p = root_path / name
-                if p.suffix.lower() in image_set:
-                    image_files.append(p)
-    else:
-        for p in input_path.iterdir():
-            if p.is_file() and p.suffix.lower() in image_set:
-                image_files.append(p)
+    # Collect (path, stat) pairs in one pass; the stat serves both the sort and
+    # process_image's size/mtime checks
+    stats = dict(sorted(_iter_images(input_path, recursive), key=lambda item: item[1].st_mtime, reverse=True))
+    image_files = list(stats)
     total_files = len(image_files)
     logging.info(f"Found {total_files} image files to process.")
-    
-    # Sort files by modification time, newest first
-    image_files.sort(key=lambda f: os.path.getmtime(f), reverse=True)
     logging.info("Files sorted by modification time, processing newest first")
 
-    success_count = 0
-    skip_count = 0
-    tracked_skip_count = 0  # Count files skipped due to tracking DB
-    error_count = 0
-    
+    counts = Counter()
     results = [] if return_data else None
 
     # Batching option (still useful for rate limiting even in single thread)
-    if batch_size > 0:
-        batch_files = []
-        batch_num = 1
-        for idx, file_path in enumerate(image_files):
-            batch_files.append(file_path)
-            if len(batch_files) >= batch_size:
-                logging.info(f"Processing batch {batch_num}...")
-                for bf in batch_files:
-                    if return_data:
-                        result, tags = process_image(bf, server, model, quiet, override, 
-                                                   ollama_restart_cmd, restart_on_failure, 
-                                                   return_data=True)
-                        if result is True:
-                            success_count += 1
-                            if results is not None:
-                                results.append((bf, result, tags))
-                        elif result == "skipped":
-                            skip_count += 1
-                        else:
-                            error_count += 1
-                    else:
-                        ok = process_image(bf, server, model, quiet, override, 
-                                         ollama_restart_cmd, restart_on_failure)
-                        if ok is True:
-                            success_count += 1
-                        elif ok == "skipped":
-                            skip_count += 1
-                        else:
-                            error_count += 1
-                            
-                batch_files = []
-                batch_num += 1
-                if batch_delay > 0 and idx < total_files - 1:
-                    logging.info(f"Pausing for {batch_delay} seconds between batches...")
-                    time.sleep(batch_delay)
-                    
-        # leftover batch
-        if batch_files:
-            logging.info(f"Processing final batch...")
-            for bf in batch_files:
-                if return_data:
-                    result, tags = process_image(bf, server, model, quiet, override, 
-                                               ollama_restart_cmd, restart_on_failure, 
-                                               return_data=True)
-                    if result is True:
-                        success_count += 1
-                        if results is not None:
-                            results.append((bf, result, tags))
-                    elif result == "skipped":
-                        skip_count += 1
-                    else:
-                        error_count += 1
-                else:
-                    ok = process_image(bf, server, model, quiet, override, 
-                                     ollama_restart_cmd, restart_on_failure)
-                    if ok is True:
-                        success_count += 1
-                    elif ok == "skipped":
-                        skip_count += 1
-                    else:
-                        error_count += 1
-    else:
-        # Process without batching
-        for file_path in image_files:
-            if return_data:
-                result, tags = process_image(file_path, server, model, quiet, override, 
-                                           ollama_restart_cmd, restart_on_failure, 
-                                           return_data=True)
-                if result is True:
-                    success_count += 1
-                    if results is not None:
-                        results.append((file_path, result, tags))
-                elif result == "skipped":
-                    skip_count += 1
-                else:
-                    error_count += 1
-            else:
-                ok = process_image(file_path, server, model, quiet, override, 
-                                 ollama_restart_cmd, restart_on_failure)
-                if ok is True:
-                    success_count += 1
-                elif ok == "skipped":
-                    skip_count += 1
-                else:
-                    error_count += 1
+    batches = list(_chunked(image_files, batch_size)) if batch_size > 0 else [image_files]
+    for batch_num, batch_files in enumerate(batches, 1):
+        batch_started = time.monotonic()
+        if batch_size > 0:
+            logging.info(f"Processing batch {batch_num}...")
+        if not override:
+            # Files unchanged since they were tagged are skipped in one tracker
+            # lookup per batch rather than one process_image call each
+            unchanged = tracked_unchanged({path: stats[path] for path in batch_files})
+            if unchanged:
+                counts["skipped"] += len(unchanged)
+                if not quiet:
+                    logging.info(f"🔄 Skipping {len(unchanged)} already processed files (tracking)")
+                batch_files = [path for path in batch_files if path not in unchanged]
+        for path, result, data in _dispatch(batch_files, threads, server, model, quiet, override,
+                                            ollama_restart_cmd, restart_on_failure, return_data, stats):
+            counts[result] += 1
+            # data is only set for tagged images when return_data is on
+            if results is not None and data is not None:
+                results.append((path, *data))
+        if batch_size > 0 and batch_delay > 0 and batch_num < len(batches):
+            # batch_delay is the minimum spacing between batch starts, so a batch
+            # that already took that long goes straight on to the next
+            remaining = batch_delay - (time.monotonic() - batch_started)
+            if remaining > 0:
+                logging.info(f"Pausing for {remaining:.1f} seconds between batches...")
+                time.sleep(remaining)
 
+    success_count = counts[True]
+    skip_count = counts["skipped"]
+    error_count = counts[False]
     logging.info(f"Processing complete: {success_count} tagged, {skip_count} skipped, {error_count} errors")
     
     if return_data:
@@ -1093,6 +1947,42 @@ def process_directory(input_path, server, model, recursive=True, quiet=False,
             "total_files": total_files
         }
 
+def iter_search_images(root_path, query, recursive=False):
+    """
+    Lazily yield image paths in a directory whose metadata contains the query string.
+    
+    Files are read SEARCH_BATCH_SIZE at a time with a single exiftool call per
+    batch, SEARCH_WORKERS batches at once (each on its own exiftool process).
+    Matches come out in walk order, and callers that only need the first few
+    (e.g. with itertools.islice) stop before walking the whole tree.
+    
+    Args:
+        root_path: Directory to search in
+        query: Text to search for in image metadata
+        recursive: Whether to search subdirectories
+        
+    Yields:
+        File paths (as strings) that match the query
+    """
+    qlower = query.lower()
+    
+    # Search only needs names, so skip the per-file stat that _iter_images does
+    paths = (entry.path for entry in scan_files(root_path, recursive))
+    pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS)
+    in_flight = deque()
+    try:
+        while True:
+            while len(in_flight) < SEARCH_WORKERS and (batch := list(islice(paths, SEARCH_BATCH_SIZE))):
+                in_flight.append((batch, pool.submit(get_metadata_texts_exiftool, batch)))
+            if not in_flight:
+                break
+            batch, future = in_flight.popleft()
+            texts = future.result()
+            yield from (path for path in batch if qlower in texts.get(path, ""))
+    finally:
+        # An abandoned search does not wait for batches nobody will look at
+        pool.shutdown(wait=False, cancel_futures=True)
+
 def search_images(root_path, query, recursive=False):
     """
     Search images in a directory for metadata containing the query string.
@@ -1105,43 +1995,41 @@ def search_images(root_path, query, recursive=False):
     Returns:
         List of file paths that match the query
     """
-    image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.heic', '.heif', '.tif', '.tiff')
-    root_path = Path(root_path)
-    
-    if recursive:
-        files = root_path.rglob('*')
-    else:
-        files = root_path.glob('*')
-    
-    matches = []
-    qlower = query.lower()
-    
-    for file_path in files:
-        if file_path.suffix.lower() in image_extensions and file_path.is_file():
-            # Grab the text fields via exiftool
-            metadata_str = get_metadata_text_exiftool(file_path)
-            if qlower in metadata_str:
-                matches.append(str(file_path))
-    
-    return matches
+    return list(iter_search_images(root_path, query, recursive))
 
 # The following functions implement file tracking and metadata updating
 def get_processed_db_path():
-    """Returns the path to the processed files database from config."""
+    """Returns the path to the text tracker (shared with the standalone CLI) from config."""
     config = load_config()
     return Path(config.get("tracking_db_path", "/var/log/image-tagger.db"))
 
+def get_tracker_db_path():
+    """Returns the path to the SQLite tracking database from config."""
+    config = load_config()
+    return Path(config.get("tracking_sqlite_path") or _DEFAULT_TRACKER_DB)
+
+# exiftool splits a list-tag value on this (-sep), so all keywords go in one
+# option. Not "#"-led: argfile lines starting with "#" are comments
+KEYWORD_SEP = "||"
+
+def _list_tag_args(tags, *names):
+    """exiftool args adding every tag to each of the list-type tags in names."""
+    if any(KEYWORD_SEP in tag for tag in tags):
+        # A tag containing the separator would be split, so add them one by one
+        return [f"-{name}+={tag}" for tag in tags for name in names]
+    joined = KEYWORD_SEP.join(tags)
+    return ["-sep", KEYWORD_SEP, *(f"-{name}+={joined}" for name in names)]
+
 def update_image_metadata(image_path, description, tags, is_override, max_retries):
     """Update image metadata with description and tags using exiftool (Nextcloud-first) and sidecar fallback."""
     image_path = Path(image_path)
-    
-    # Detect actual file format regardless of extension
-    actual_format = detect_actual_image_format(image_path)
     file_extension = image_path.suffix.lower()
-    
-    # Log format detection for debugging
-    if actual_format and actual_format != file_extension.lstrip('.'):
-        logging.info(f"📝 File {image_path} has {file_extension} extension but is actually {actual_format.upper()}")
+
+    # exiftool refuses a .png that is really a JPEG ("Not a valid PNG"), so check
+    # the header of .png files up front and write those as JPEG the first time
+    png_is_jpeg = file_extension == '.png' and detect_actual_image_format(image_path) == 'jpeg'
+    if png_is_jpeg:
+        logging.info(f"📝 File {image_path} has {file_extension} extension but is actually JPEG")
     
     cfg = load_config()
     timeout_s = int(cfg.get("exiftool_timeout_seconds", 60))
@@ -1151,6 +2039,8 @@ def update_image_metadata(image_path, description, tags, is_override, max_retrie
         try:
             # Prepare exiftool command
             cmd = ["exiftool", "-P", "-overwrite_original"]
+            if png_is_jpeg:
+                cmd.append("-FileType=JPEG")
             
             # Add description
             if description:
@@ -1159,13 +2049,9 @@ def update_image_metadata(image_path, description, tags, is_override, max_retrie
                     f"-XMP-dc:Description={description}"
                 ])
                 
-            # Add tags as keywords/subjects (multiple occurrences)
+            # Add tags as keywords/subjects
             if tags:
-                for tag in tags:
-                    cmd.extend([
-                        f"-IPTC:Keywords+={tag}",
-                        f"-XMP-dc:Subject+={tag}"
-                    ])
+                cmd.extend(_list_tag_args(tags, "IPTC:Keywords", "XMP-dc:Subject"))
                 # Also write XPKeywords as a comma-separated list for Windows compatibility
                 cmd.extend([f"-XPKeywords={', '.join(tags)}"])
             
@@ -1176,45 +2062,18 @@ def update_image_metadata(image_path, description, tags, is_override, max_retrie
             cmd.append(str(image_path))
             
             # Execute the command
-            rc, out, err = run_cmd_with_timeout(cmd, timeout_seconds=timeout_s)
+            rc, out, err = run_exiftool(cmd, timeout_seconds=timeout_s)
             
             if rc == 0:
-                logging.info(f"✅ Updated metadata for: {image_path}")
+                if png_is_jpeg:
+                    logging.info(f"✅ Updated metadata for JPEG file with PNG extension: {image_path}")
+                else:
+                    logging.info(f"✅ Updated metadata for: {image_path}")
                 return True
             else:
                 error_msg = err.strip() if err else "Unknown error"
                 logging.error(f"❌ exiftool failed (attempt {attempt + 1}/{max_retries}): {error_msg}")
                 
-                # If it's a PNG file that's actually a JPEG, try with JPEG format
-                if (file_extension == '.png' and actual_format == 'jpeg' and 
-                    'Not a valid PNG' in error_msg and 'looks more like a JPEG' in error_msg):
-                    logging.info(f"🔄 Retrying with JPEG format for {image_path}")
-                    # Try again with explicit JPEG format
-                    jpeg_cmd = ["exiftool", "-P", "-overwrite_original", "-FileType=JPEG"]
-                    if description:
-                        jpeg_cmd.extend([
-                            f"-ImageDescription={description}",
-                            f"-XMP-dc:Description={description}"
-                        ])
-                    if tags:
-                        for tag in tags:
-                            jpeg_cmd.extend([
-                                f"-IPTC:Keywords+={tag}",
-                                f"-XMP-dc:Subject+={tag}"
-                            ])
-                        jpeg_cmd.extend([f"-XPKeywords={', '.join(tags)}"])
-                    # Preserve timestamps and copy original tags
-                    jpeg_cmd.extend(["-tagsFromFile", "@", "-time:all"])
-                    jpeg_cmd.append(str(image_path))
-                    
-                    jrc, jout, jerr = run_cmd_with_timeout(jpeg_cmd, timeout_seconds=timeout_s)
-                    if jrc == 0:
-                        logging.info(f"✅ Updated metadata for JPEG file with PNG extension: {image_path}")
-                        return True
-                    else:
-                        jpeg_error = jerr.strip() if jerr else "Unknown error"
-                        logging.error(f"❌ JPEG format retry failed: {jpeg_error}")
-                
                 # Sidecar fallback
                 try:
                     # Prefer same-directory sidecar when writable
@@ -1225,10 +2084,9 @@ def update_image_metadata(image_path, description, tags, is_override, max_retrie
                             f"-XMP-dc:Description={description}"
                         ]
                         if tags:
-                            for tag in tags:
-                                sidecar_cmd.extend([f"-XMP-dc:Subject+={tag}"])
+                            sidecar_cmd.extend(_list_tag_args(tags, "XMP-dc:Subject"))
                         sidecar_cmd.append(str(image_path))
-                        src, sout, serr = run_cmd_with_timeout(sidecar_cmd, timeout_seconds=timeout_s)
+                        src, sout, serr = run_exiftool(sidecar_cmd, timeout_seconds=timeout_s)
                         if src == 0:
                             logging.info(f"✅ Wrote XMP sidecar for: {image_path}")
                             return True
@@ -1244,10 +2102,9 @@ def update_image_metadata(image_path, description, tags, is_override, max_retrie
                             f"-XMP-dc:Description={description}"
                         ]
                         if tags:
-                            for tag in tags:
-                                sidecar_cmd2.extend([f"-XMP-dc:Subject+={tag}"])
+                            sidecar_cmd2.extend(_list_tag_args(tags, "XMP-dc:Subject"))
                         sidecar_cmd2.append(str(image_path))
-                        s2rc, s2out, s2err = run_cmd_with_timeout(sidecar_cmd2, timeout_seconds=timeout_s)
+                        s2rc, s2out, s2err = run_exiftool(sidecar_cmd2, timeout_seconds=timeout_s)
                         if s2rc == 0:
                             logging.info(f"✅ Wrote XMP sidecar to fallback directory for: {image_path}")
                             return True
@@ -1274,42 +2131,53 @@ def update_image_metadata(image_path, description, tags, is_override, max_retrie
 # --- CLI/Utility Functions ---
 def clean_processed_db():
     """Remove entries for files that no longer exist from the tracking database."""
-    db_path = get_processed_db_path()
-    if not db_path.exists():
+    db_path = get_tracker_db_path()
+    legacy_path = get_processed_db_path()
+    if not db_path.exists() and not legacy_path.exists():
         logging.info("No tracking database found to clean.")
         return 0
     try:
-        # Read all entries
-        with open(db_path, 'r') as f:
-            entries = f.readlines()
-        # Filter to keep only entries for files that still exist
-        valid_entries = []
-        removed_count = 0
-        for entry in entries:
-            parts = entry.strip().split(':', 1)
-            if len(parts) != 2:
-                continue
-            file_path = parts[0]
-            if Path(file_path).exists():
-                valid_entries.append(entry)
-            else:
-                removed_count += 1
-        # Write back only valid entries
-        with open(db_path, 'w') as f:
-            f.writelines(valid_entries)
-        return removed_count
+        with _processed_lock:
+            _flush_tracker()
+            conn = _tracker_connection(db_path)
+            if conn is None:
+                return _clean_legacy_tracker(legacy_path)
+            paths = [path for (path,) in conn.execute("SELECT path FROM processed")]
+        # Keep only entries for files that still exist; the existence checks run
+        # without the lock so lookups from other threads are not held up
+        missing = [(path,) for path in paths if not os.path.exists(path)]
+        with _processed_lock:
+            conn = _tracker_connection(db_path)
+            if conn is None:
+                return 0
+            with conn:
+                conn.executemany("DELETE FROM processed WHERE path = ?", missing)
+        return len(missing)
     except Exception as e:
         logging.error(f"Error cleaning tracking database: {e}")
         return -1
 
+def _clean_legacy_tracker(legacy_path):
+    """Rewrite the text tracker without lines for missing files (fallback mode only)."""
+    if not legacy_path.exists():
+        return 0
+    with open(legacy_path, 'r', errors='replace') as f:
+        lines = f.readlines()
+    kept = [line for line in lines
+            if os.path.exists(line.rstrip('\n').split('\t', 1)[0].rpartition(':')[0])]
+    with open(legacy_path, 'w') as f:
+        f.writelines(kept)
+    return len(lines) - len(kept)
+
+_dependencies_ok = False
+
 def check_dependencies():
     """Verify that required external tools are available."""
-    missing = []
-    for cmd in ["exiftool"]:
-        try:
-            subprocess.run([cmd, "-ver"], capture_output=True, check=False)
-        except FileNotFoundError:
-            missing.append(cmd)
+    global _dependencies_ok
+    if _dependencies_ok:
+        return
+    # A PATH lookup instead of running each tool (exiftool -ver costs a Perl startup)
+    missing = [cmd for cmd in ["exiftool"] if shutil.which(cmd) is None]
     if missing:
         logging.error(f"❌ Missing required dependencies: {', '.join(missing)}")
         logging.error("Please install them before continuing.")
@@ -1317,3 +2185,4 @@ def check_dependencies():
             logging.error("  - macOS: brew install exiftool")
             logging.error("  - Linux: apt install libimage-exiftool-perl")
         sys.exit(1)
+    _dependencies_ok = True
@@ -1,23 +1,23 @@
 import base64
-import json
 import logging
-import re
 import subprocess
 import tempfile
 import time
 from pathlib import Path
 
-import requests
 from PIL import Image
 
 from .core import (
     clean_description,
     extract_tags_from_description,
+    http_session,
     is_image_already_processed_in_db,
     is_file_processed,
+    json_loads,
     load_config,
     mark_file_as_processed,
     normalize_tags,
+    parse_reply_content,
     update_image_processing_status,
 )
 
@@ -58,7 +58,7 @@ def get_video_duration(path: Path) -> float:
         ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", str(path)],
         capture_output=True, text=True, timeout=30
     )
-    data = json.loads(result.stdout)
+    data = json_loads(result.stdout)
     return float(data["format"]["duration"])
 
 
@@ -125,7 +125,7 @@ def process_video(path, server, model, return_data=False, quiet=False, db_sessio
                 import io
                 buf = io.BytesIO()
                 img.save(buf, "JPEG", quality=85)
-                base64_image = base64.b64encode(buf.getvalue()).decode("utf-8")
+                base64_image = base64.b64encode(buf.getbuffer()).decode("ascii")
     except Exception as e:
         logging.error(f"❌ Frame extraction failed for {path}: {e}")
         update_image_processing_status(path, "failed", str(e), db_session=db_session)
@@ -154,14 +154,14 @@ def process_video(path, server, model, return_data=False, quiet=False, db_sessio
                     "temperature": temperature,
                     "max_tokens": max_output_tokens,
                 }
-                response = requests.post(url, json=payload, timeout=300)
+                response = http_session.post(url, json=payload, timeout=300)
                 if response.status_code != 200:
                     logging.error(f"❌ Video API error (HTTP {response.status_code}) attempt {attempt+1}/{max_retries}")
                     if attempt == max_retries - 1:
                         update_image_processing_status(path, "failed", f"HTTP {response.status_code}", db_session=db_session)
                     time.sleep(3)
                     continue
-                content = (response.json().get("choices", [{}])[0]
+                content = (json_loads(response.content).get("choices", [{}])[0]
                            .get("message", {}).get("content", "")).strip()
             else:
                 url = f"{server}/api/generate"
@@ -173,31 +173,13 @@ def process_video(path, server, model, return_data=False, quiet=False, db_sessio
                     "stream": False,
                     "options": {"temperature": temperature, "num_predict": max_output_tokens},
                 }
-                response = requests.post(url, json=payload, timeout=300)
-                content = response.json().get("response", "").strip()
+                response = http_session.post(url, json=payload, timeout=300)
+                content = json_loads(response.content).get("response", "").strip()
 
             if not content:
                 raise ValueError("Empty response")
 
-            cleaned = content.strip()
-            if cleaned.startswith("```"):
-                cleaned = "\n".join(l for l in cleaned.split("\n") if not l.strip().startswith("```")).strip()
-
-            description, tags = None, None
-            try:
-                inner = json.loads(cleaned)
-                if isinstance(inner, dict):
-                    description = (inner.get("description") or "").strip() or None
-                    tags = normalize_tags(inner.get("tags") or [])
-            except Exception:
-                m = re.search(r'"description"\s*:\s*"((?:[^"\\]|\\.)*)"', cleaned)
-                if m:
-                    description = m.group(1).strip()
-                mt = re.search(r'"tags"\s*:\s*\[(.*?)\]', cleaned, re.DOTALL)
-                if mt:
-                    tags = normalize_tags([t.strip().strip('"\'') for t in mt.group(1).split(",") if t.strip().strip('"\'')])
-                if not description:
-                    description = content
+            description, tags = parse_reply_content(content)
 
             if not description:
                 raise ValueError("Empty description")
@@ -11,12 +11,23 @@ from pathlib import Path
 
 # Import core logic
 from image_tagger.core import (
-    process_image, process_directory, clean_processed_db, load_config,
+    process_image, process_directory, clean_processed_db, load_config, override_config,
     check_dependencies, mark_file_as_processed, is_file_processed
 )
 
-def setup_logging(quiet=False):
-    """Configure logging for the CLI."""
+_logging_configured = False
+
+def setup_logging(quiet=False, force=False):
+    """Configure logging for the CLI.
+
+    Runs once per process; later calls are no-ops unless force is set, so
+    importing code that calls it again does not rebuild the handlers.
+    """
+    global _logging_configured
+    if _logging_configured and not force:
+        return
+    _logging_configured = True
+
     # Configure logging level
     log_level = logging.WARNING if quiet else logging.INFO
     
@@ -33,6 +44,7 @@ def setup_logging(quiet=False):
     # Remove any existing handlers
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        handler.close()
     
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -102,7 +114,9 @@ Examples:
     parser.add_argument('--no-file-tracking', action='store_true', help='Disable file tracking (process all files)')
     parser.add_argument('--clean-db', action='store_true', help='Clean tracking database of non-existent files')
     parser.add_argument('--batch-size', type=int, default=0, help='Batch size for processing (default: no batching)')
-    parser.add_argument('--batch-delay', type=int, default=5, help='Delay (seconds) between batches')
+    parser.add_argument('--batch-delay', type=int, default=5, help='Minimum seconds from the start of one batch to the next')
+    parser.add_argument('--threads', '--concurrency', dest='threads', type=int, default=None,
+                        help='Images to process concurrently (default: "concurrency" from config, else 1)')
     parser.add_argument('--restart-on-failure', action='store_true', help='Restart Ollama on API failure (if configured)')
     args = parser.parse_args()
 
@@ -125,16 +139,18 @@ Examples:
     model  = args.model    if args.model    else config.get("model", "llama3.2-vision")
     ollama_restart_cmd = config.get("ollama_restart_cmd", None)
     restart_on_failure = args.restart_on_failure
+    threads = args.threads if args.threads is not None else int(config.get("concurrency", 1))
 
     # Log configuration being used
     logging.info(f"🚀 Starting Image Tagger CLI")
     logging.info(f"🔧 Server: {server}")
     logging.info(f"🔧 Model: {model}")
     logging.info(f"📂 Target: {input_path}")
+    logging.info(f"🔧 Concurrency: {threads}")
 
     # Override file tracking if requested via command line
     if args.no_file_tracking:
-        config["use_file_tracking"] = False
+        override_config(use_file_tracking=False)
         logging.info("File tracking disabled via command line")
 
     # Handle database cleaning if requested
@@ -155,7 +171,7 @@ Examples:
             input_path, server, model,
             args.recursive, args.quiet, args.override,
             ollama_restart_cmd, args.batch_size,
-            args.batch_delay, 1,  # Always use 1 thread
+            args.batch_delay, max(1, threads),
             restart_on_failure=restart_on_failure
         )
     else:
@@ -1,8 +1,10 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Table, create_engine, Text, text
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker, Session
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, Table, create_engine, Text, text, event
+from sqlalchemy.orm import DeclarativeBase, relationship, sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
 # Many-to-many relationship table between images and tags
 image_tags = Table(
@@ -37,6 +39,13 @@ class Image(Base):
 
     tags = relationship("Tag", secondary=image_tags, back_populates="images")
 
+    # path and tags.name are indexed through their unique constraints, and the
+    # single-column status index already returns rows in id order for the
+    # paginated listing. This one serves status filters ordered by processing time.
+    __table_args__ = (
+        Index("ix_images_status_processed", "processing_status", "processed_at"),
+    )
+
     @property
     def relative_path(self):
         return str(self.path)
@@ -66,24 +75,60 @@ engine = None
 SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Per-connection SQLite settings, applied to every pooled connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # WAL keeps the DB consistent at NORMAL; only the last commits are at risk on power loss
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped reads
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 def get_db_engine(db_path="sqlite:///image_tagger.db"):
     """Create a SQLAlchemy engine with SQLite-specific settings."""
-    connect_args = {}
-    if db_path.startswith("sqlite"):
-        connect_args = {"check_same_thread": False}
-        engine = create_engine(db_path, connect_args=connect_args)
-        with engine.connect() as conn:
-            conn.execute(text("PRAGMA journal_mode=WAL"))
-            conn.execute(text("PRAGMA foreign_keys=ON"))
-        return engine
-    return create_engine(db_path, connect_args=connect_args)
+    if not db_path.startswith("sqlite"):
+        return create_engine(db_path)
+    # Larger per-connection statement cache for the repeated image/tag queries
+    connect_args = {"check_same_thread": False, "cached_statements": 256}
+    if ":memory:" in db_path or db_path in ("sqlite://", "sqlite:///"):
+        # Every new connection to an in-memory DB is a fresh empty database
+        engine_kwargs = {"poolclass": StaticPool}
+    else:
+        # Keep enough connections (and their page caches) open for the request
+        # threads and background workers that read while the tagger writes
+        engine_kwargs = {"pool_size": 10}
+    engine = create_engine(db_path, connect_args=connect_args, **engine_kwargs)
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def schema_present(db_engine):
+    """Return True if every mapped table and named index already exists (single sqlite_master query)."""
+    if db_engine.dialect.name != "sqlite":
+        return False
+    with db_engine.connect() as conn:
+        existing = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')"))}
+    expected = set(Base.metadata.tables)
+    expected.update(index.name for table in Base.metadata.tables.values() for index in table.indexes)
+    return expected.issubset(existing)
 
 
 def init_db(db_engine):
     """Initialize the database: create tables and configure session factory."""
     global engine
     engine = db_engine
-    Base.metadata.create_all(bind=engine)
+    # Skip the CREATE TABLE IF NOT EXISTS round trips on every boot once the schema exists
+    if not schema_present(engine):
+        Base.metadata.create_all(bind=engine)
+        # create_all skips tables that already exist, indexes included, so
+        # indexes added to an existing table are created here
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
     SessionLocal.configure(bind=engine)
 
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, List, Optional, Union
 
 # Configuration schemas
@@ -25,8 +25,7 @@ class Tag(BaseModel):
     id: int
     name: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TagCreate(BaseModel):
     name: str
\ No newline at end of file
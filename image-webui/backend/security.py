@@ -19,6 +19,14 @@ import ipaddress
 
 logger = logging.getLogger(__name__)
 
+# Compiled once for InputValidator, which runs on request paths
+_PATH_TRAVERSAL_RE = re.compile(r'\.\.|//|\\|~')  # traversal, repeated slashes, Windows separators, home dir
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+_IMAGE_EXTENSIONS = frozenset((
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp',
+    '.heic', '.heif', '.tif', '.tiff', '.webp', '.avif'
+))
+
 class RateLimiter:
     """Simple in-memory rate limiter"""
     
@@ -65,16 +73,8 @@ class InputValidator:
             return False
         
         # Check for path traversal attempts
-        dangerous_patterns = [
-            r'\.\.',  # Directory traversal
-            r'//',    # Multiple slashes
-            r'\\',    # Windows path separators
-            r'~',     # Home directory
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, path):
-                return False
+        if _PATH_TRAVERSAL_RE.search(path):
+            return False
         
         # Ensure path is relative and doesn't start with /
         if path.startswith('/') or path.startswith('\\'):
@@ -89,8 +89,7 @@ class InputValidator:
             return ""
         
         # Remove or replace dangerous characters
-        dangerous_chars = r'[<>:"/\\|?*\x00-\x1f]'
-        sanitized = re.sub(dangerous_chars, '_', filename)
+        sanitized = _UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
         
         # Limit length
         if len(sanitized) > 255:
@@ -102,16 +101,11 @@ class InputValidator:
     @staticmethod
     def validate_image_extension(filename: str) -> bool:
         """Validate that file has a safe image extension"""
-        allowed_extensions = {
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp',
-            '.heic', '.heif', '.tif', '.tiff', '.webp', '.avif'
-        }
-        
         if not filename:
             return False
         
         file_ext = Path(filename).suffix.lower()
-        return file_ext in allowed_extensions
+        return file_ext in _IMAGE_EXTENSIONS
 
 class SecurityMiddleware:
     """Security middleware for FastAPI"""
@@ -8,10 +8,11 @@ from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
 from typing import Optional
 import random
-from PIL import Image as PILImage
+from collections import Counter
 
 try:
     from zoneinfo import ZoneInfo
@@ -19,10 +20,11 @@ try:
 except ImportError:
     HAS_ZONEINFO = False
 
+from .config import Config
 from .models import Folder, Image, Tag, SessionLocal
 from .image_tagger import core as tagger
 from .image_tagger import video as video_tagger
-from .utils import log_error_with_context, log_performance_metric
+from .utils import log_error_with_context, log_performance_metric, make_thumbnail
 from . import globals
 from .api.thumbnails import get_thumbnail_path
 
@@ -35,7 +37,6 @@ _low_priority_applied = False
 
 def _get_processing_limits():
     """Load processing limits from config with safe fallbacks."""
-    from .config import Config
     return {
         "max_workers": max(1, Config.getint("processing", "max_workers", fallback=1)),
         "llm_inter_image_delay_seconds": max(0.0, Config.getfloat("processing", "llm_inter_image_delay_seconds", fallback=1.5)),
@@ -78,33 +79,25 @@ def _apply_low_priority_settings():
         _low_priority_applied = True
 
 
-def _iter_image_files(folder_path: Path, recursive: bool):
-    """Yield image and video files lazily to avoid materializing huge libraries in memory."""
-    iterator = folder_path.rglob("*") if recursive else folder_path.glob("*")
-    for entry in iterator:
-        if entry.is_file() and entry.suffix.lower() in MEDIA_EXTENSIONS:
-            yield entry
-
-
 def _add_tags_to_image(db: Session, image: Image, tag_names):
-    for tag_name in tag_names:
-        tag = db.query(Tag).filter_by(name=tag_name).first()
-        if not tag:
-            tag = Tag(name=tag_name)
-            db.add(tag)
-        image.tags.append(tag)
+    names = list(dict.fromkeys(tag_names))
+    if not names:
+        return
+    # One INSERT for any missing tags; DO NOTHING also covers another worker
+    # creating the same tag between our statements
+    db.execute(sqlite_insert(Tag).values([{"name": name} for name in names])
+               .on_conflict_do_nothing(index_elements=["name"]))
+    image.tags.extend(db.query(Tag).filter(Tag.name.in_(names)).all())
 
 
 def is_schedule_enabled() -> bool:
     """Returns True if the processing schedule is enabled."""
-    from .config import Config
     return Config.getboolean('schedule', 'enabled', fallback=False)
 
 
 def _get_schedule_now():
     """Get the current time in the configured schedule timezone.
     Falls back to system local time if zoneinfo is not available or no timezone is configured."""
-    from .config import Config
     tz_name = Config.get('schedule', 'timezone', fallback=None)
     if tz_name and HAS_ZONEINFO:
         try:
@@ -121,7 +114,6 @@ def is_within_schedule_window() -> bool:
 
     Uses the configured schedule timezone (defaulting to the system local time)
     so that the start/end hours match the user's clock."""
-    from .config import Config
     if not is_schedule_enabled():
         return True
     start_hour = Config.getint('schedule', 'start_hour', fallback=1)
@@ -339,22 +331,24 @@ class ScheduleChecker:
 
 
 # Image file extensions we'll monitor for changes
-IMAGE_EXTENSIONS = (
+IMAGE_EXTENSIONS = frozenset((
     '.jpg', '.jpeg', '.png', '.gif', '.bmp',
     '.heic', '.heif', '.tif', '.tiff', '.webp', '.avif'
-)
-VIDEO_EXTENSIONS = (
+))
+VIDEO_EXTENSIONS = frozenset((
     '.mp4', '.mov', '.avi', '.mkv', '.m4v', '.wmv', '.webm', '.3gp'
-)
-MEDIA_EXTENSIONS = IMAGE_EXTENSIONS + VIDEO_EXTENSIONS
+))
+MEDIA_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
 
 class ImageEventHandler(FileSystemEventHandler):
     """Handle file system events for images, process new or modified images"""
     
-    def __init__(self, server: str, model: str):
-        # Don't store db_session - create fresh session for each event
+    def __init__(self, server: str, model: str, session_factory: sessionmaker = SessionLocal):
+        # Don't store a live session - open a fresh one from the factory for
+        # each event so watcher writes never share a connection with API requests
         self.server = server
         self.model = model
+        self.session_factory = session_factory
         
     def on_created(self, event):
         """Handle new file creation events"""
@@ -380,7 +374,7 @@ class ImageEventHandler(FileSystemEventHandler):
 
         try:
             # Create fresh database session for this event
-            db = SessionLocal()
+            db = self.session_factory()
 
             try:
                 # Check if image already exists in database
@@ -434,35 +428,9 @@ class ImageEventHandler(FileSystemEventHandler):
                         thumbnail_path = get_thumbnail_path(new_image.id, 200)
                         
                         # Generate thumbnail using PIL
-                        with PILImage.open(image_path) as img:
-                            # Convert RGBA to RGB if needed
-                            if img.mode in ('RGBA', 'LA'):
-                                background = PILImage.new('RGB', img.size, (255, 255, 255))
-                                if img.mode == 'RGBA':
-                                    background.paste(img, mask=img.split()[-1])
-                                else:
-                                    background.paste(img, mask=img.split()[-1])
-                                img = background
-                            elif img.mode == 'P':
-                                img = img.convert('RGB')
-                            elif img.mode not in ('RGB', 'L'):
-                                img = img.convert('RGB')
-                            
-                            # Calculate new dimensions while preserving aspect ratio
-                            width, height = img.size
-                            if width > height:
-                                new_width = 200
-                                new_height = int(height * (200 / width))
-                            else:
-                                new_height = 200
-                                new_width = int(width * (200 / height))
-                            
-                            # Create thumbnail
-                            img.thumbnail((new_width, new_height), PILImage.Resampling.LANCZOS)
-                            
-                            # Save thumbnail
-                            img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
-                            logger.debug(f"Generated thumbnail: {thumbnail_path}")
+                        img = make_thumbnail(image_path, 200)
+                        img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
+                        logger.debug(f"Generated thumbnail: {thumbnail_path}")
                             
                     except Exception as e:
                         logger.error(f"Error generating thumbnail for {image_path}: {e}")
@@ -495,25 +463,9 @@ class ImageEventHandler(FileSystemEventHandler):
         """Generate and save a thumbnail for an image given its DB id."""
         try:
             thumbnail_path = get_thumbnail_path(image_id, 200)
-            with PILImage.open(image_path) as img:
-                if img.mode in ('RGBA', 'LA'):
-                    background = PILImage.new('RGB', img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[-1])
-                    img = background
-                elif img.mode == 'P':
-                    img = img.convert('RGB')
-                elif img.mode not in ('RGB', 'L'):
-                    img = img.convert('RGB')
-                width, height = img.size
-                if width > height:
-                    new_width = 200
-                    new_height = int(height * (200 / width))
-                else:
-                    new_height = 200
-                    new_width = int(width * (200 / height))
-                img.thumbnail((new_width, new_height), PILImage.Resampling.LANCZOS)
-                img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
-                logger.debug(f"Generated thumbnail: {thumbnail_path}")
+            img = make_thumbnail(image_path, 200)
+            img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
+            logger.debug(f"Generated thumbnail: {thumbnail_path}")
         except Exception as e:
             logger.error(f"Error generating thumbnail for {image_path}: {e}")
 
@@ -521,19 +473,8 @@ def _make_thumbnail(image_path: Path, image_id: int):
     """Generate and save a thumbnail for an image by its DB id."""
     try:
         thumbnail_path = get_thumbnail_path(image_id, 200)
-        with PILImage.open(image_path) as img:
-            if img.mode in ('RGBA', 'LA'):
-                bg = PILImage.new('RGB', img.size, (255, 255, 255))
-                bg.paste(img, mask=img.split()[-1])
-                img = bg
-            elif img.mode not in ('RGB', 'L'):
-                img = img.convert('RGB')
-            w, h = img.size
-            if w > h:
-                img.thumbnail((200, int(h * 200 / w)), PILImage.Resampling.LANCZOS)
-            else:
-                img.thumbnail((int(w * 200 / h), 200), PILImage.Resampling.LANCZOS)
-            img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
+        img = make_thumbnail(image_path, 200)
+        img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
     except Exception as e:
         logger.debug(f"Thumbnail generation skipped for {image_path}: {e}")
 
@@ -638,11 +579,16 @@ def scan_db_for_untagged_images(server: str, model: str) -> int:
         db.close()
 
 
-def start_folder_watchers(db_session: Session, server: str, model: str) -> Optional[Observer]:
-    """Start watching folders for new images"""
+def start_folder_watchers(session_factory: sessionmaker, server: str, model: str) -> Optional[Observer]:
+    """Start watching folders for new images.
+
+    ``session_factory`` is called once per unit of work (folder lookup here,
+    one call per file event in the handlers) instead of sharing a single
+    session, so SQLite doesn't serialize the watcher against API requests.
+    """
     try:
-        # Create fresh database session
-        db = SessionLocal()
+        # Short-lived session just for the folder lookup
+        db = session_factory()
         
         try:
             # Get all active folders
@@ -660,7 +606,7 @@ def start_folder_watchers(db_session: Session, server: str, model: str) -> Optio
                 try:
                     folder_path = Path(folder.path)
                     if folder_path.exists() and folder_path.is_dir():
-                        event_handler = ImageEventHandler(server, model)
+                        event_handler = ImageEventHandler(server, model, session_factory)
                         observer.schedule(event_handler, str(folder_path), recursive=folder.recursive)
                         logger.info(f"Added watcher for folder: {folder.path} (recursive: {folder.recursive})")
                     else:
@@ -722,7 +668,17 @@ def process_existing_images(folder: Folder, server: str, model: str, global_prog
             if total_global_images > 0:
                 globals.app_state.task_total = total_global_images
 
-        for file_path in _iter_image_files(folder_path, folder.recursive):
+        # One query for every path already known under this folder, instead of
+        # one lookup per discovered file
+        known_paths = {
+            path for (path,) in db.query(Image.path).filter(
+                Image.path.startswith(str(folder_path), autoescape=True)
+            )
+        }
+
+        # Lazily, so huge libraries are never materialized in memory
+        for entry in tagger.scan_files(folder_path, folder.recursive, MEDIA_EXTENSIONS):
+            file_path = Path(entry.path)
             if globals.app_state.cancel_requested:
                 logger.info("process_existing_images: cancel requested — stopping loop")
                 break
@@ -731,8 +687,7 @@ def process_existing_images(folder: Folder, server: str, model: str, global_prog
             if pause_every_n > 0 and discovered_count % pause_every_n == 0 and pause_seconds > 0:
                 time.sleep(pause_seconds)
 
-            existing = db.query(Image.id).filter_by(path=str(file_path)).first()
-            if existing:
+            if str(file_path) in known_paths:
                 continue
 
             if hasattr(globals, "app_state"):
@@ -865,8 +820,7 @@ def process_images_with_ai(images, server: str, model: str, progress_tracker=Non
 
     image_ids = list(dict.fromkeys(image_ids))
     total_images = len(image_ids)
-    processed_count = 0
-    error_count = 0
+    counts = Counter()  # worker result (True/False) -> images
     stopped_by_schedule = False
 
     if not is_within_schedule_window():
@@ -1008,18 +962,17 @@ def process_images_with_ai(images, server: str, model: str, progress_tracker=Non
                     fut.cancel()
 
         for fut in as_completed(futures):
-            ok = False
+            if fut.cancelled():
+                # Never started because of cancel/schedule stop; the image stays pending
+                continue
             try:
                 ok = bool(fut.result())
             except Exception as e:
                 logger.error(f"Worker error: {e}")
                 ok = False
-            if ok:
-                processed_count += 1
-            else:
-                error_count += 1
+            counts[ok] += 1
             if progress_tracker:
-                done = processed_count + error_count
+                done = counts[True] + counts[False]
                 progress_tracker.update({
                     "current_task": f"Processed {done} of {total_images}",
                     "completed_tasks": done,
@@ -1031,7 +984,7 @@ def process_images_with_ai(images, server: str, model: str, progress_tracker=Non
 
     if progress_tracker:
         progress_tracker.update({
-            "current_task": f"AI processing completed - {processed_count} processed, {error_count} errors",
+            "current_task": f"AI processing completed - {counts[True]} processed, {counts[False]} errors",
             "progress": 100.0,
             "completed_tasks": total_images,
             "task_total": total_images,
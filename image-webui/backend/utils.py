@@ -5,6 +5,7 @@ from pathlib import Path
 from datetime import datetime
 import json
 from typing import Optional, Dict, Any
+from PIL import Image as PILImage
 
 class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured logging"""
@@ -73,6 +74,10 @@ class PerformanceLogger:
         
         del self.metrics[operation]
 
+# Formatters are shared by every handler setup_logging() installs
+_PLAIN_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_STRUCTURED_FORMATTER = StructuredFormatter()
+
 def setup_logging(log_level_str: str = "INFO", log_file: Optional[str] = None, 
                  enable_structured_logging: bool = False):
     """
@@ -97,13 +102,8 @@ def setup_logging(log_level_str: str = "INFO", log_file: Optional[str] = None,
     if logger.hasHandlers():
         logger.handlers.clear()
     
-    # Create formatter
-    if enable_structured_logging:
-        formatter = StructuredFormatter()
-    else:
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
+    # Pick the shared formatter
+    formatter = _STRUCTURED_FORMATTER if enable_structured_logging else _PLAIN_FORMATTER
     
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -235,6 +235,22 @@ def setup_application_logging(config_log_level: str = "INFO",
 # Global performance logger instance
 performance_logger = PerformanceLogger()
 
+def make_thumbnail(image_path, size: int) -> PILImage.Image:
+    """Open an image and return it as an RGB/L thumbnail fitting in size x size"""
+    with PILImage.open(image_path) as img:
+        # JPEG: decode at 1/2-1/8 scale in libjpeg; no-op for other formats
+        img.draft('RGB', (size, size))
+        # Flatten transparency onto white; anything else JPEG can't store becomes RGB
+        if img.mode in ('RGBA', 'LA'):
+            background = PILImage.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            img = background
+        elif img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        # thumbnail() keeps the aspect ratio and loads the pixels before the file closes
+        img.thumbnail((size, size), PILImage.Resampling.LANCZOS)
+        return img
+
 # Example of other utility functions that might be here:
 # def some_other_utility_function():
 #     pass
@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent / "backend"))
 from backend.database import SessionLocal
 from backend.models import Image
 from backend.api.thumbnails import get_thumbnail_path
-from PIL import Image as PILImage
+from backend.utils import make_thumbnail
 import logging
 
 # Configure logging
@@ -46,37 +46,11 @@ def generate_thumbnails_for_all_images():
                     continue
                 
                 # Generate thumbnail
-                with PILImage.open(image.path) as img:
-                    # Convert RGBA to RGB if needed
-                    if img.mode in ('RGBA', 'LA'):
-                        background = PILImage.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'RGBA':
-                            background.paste(img, mask=img.split()[-1])
-                        else:
-                            background.paste(img, mask=img.split()[-1])
-                        img = background
-                    elif img.mode == 'P':
-                        img = img.convert('RGB')
-                    elif img.mode not in ('RGB', 'L'):
-                        img = img.convert('RGB')
-                    
-                    # Calculate new dimensions while preserving aspect ratio
-                    width, height = img.size
-                    if width > height:
-                        new_width = 200
-                        new_height = int(height * (200 / width))
-                    else:
-                        new_height = 200
-                        new_width = int(width * (200 / height))
-                    
-                    # Create thumbnail
-                    img.thumbnail((new_width, new_height), PILImage.Resampling.LANCZOS)
-                    
-                    # Save thumbnail
-                    img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
-                    generated_count += 1
-                    logger.info(f"Generated thumbnail for image {image.id}: {os.path.basename(image.path)}")
-                    
+                img = make_thumbnail(image.path, 200)
+                img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
+                generated_count += 1
+                logger.info(f"Generated thumbnail for image {image.id}: {os.path.basename(image.path)}")
+                
             except Exception as e:
                 logger.error(f"Error generating thumbnail for image {image.id}: {e}")
                 error_count += 1
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Checks that images with transparency or several frames are flattened by the
+Pillow encoder rather than passed through OpenCV, and that both encoders send
+the same orientation
+"""
+
+import base64
+import io
+import sys
+sys.path.append('.')
+
+from PIL import Image
+
+from backend.image_tagger import core
+
+
+def _decode(encoded):
+    return Image.open(io.BytesIO(base64.b64decode(encoded)))
+
+
+def test_transparent_webp_is_flattened_onto_white(tmp_path):
+    path = tmp_path / "transparent.webp"
+    img = Image.new("RGBA", (64, 64), (255, 0, 0, 0))
+    img.paste((0, 0, 255, 255), (16, 16, 48, 48))
+    img.save(path, "WEBP", lossless=True)
+
+    # OpenCV would read it without alpha, so it must hand the file on
+    assert core.encode_image_to_base64_opencv(path) is None
+
+    result = _decode(core.encode_image_to_base64(path)).convert("RGB")
+    r, g, b = result.getpixel((2, 2))
+    assert min(r, g, b) > 240, (r, g, b)  # transparent corner is white, not black or red
+    r, g, b = result.getpixel((32, 32))
+    assert b > 200 and r < 60, (r, g, b)
+
+
+def test_animated_webp_is_left_to_pillow(tmp_path):
+    path = tmp_path / "animated.webp"
+    frames = [Image.new("RGB", (32, 32), color) for color in ((255, 0, 0), (0, 255, 0))]
+    frames[0].save(path, "WEBP", save_all=True, append_images=frames[1:], duration=100)
+
+    assert core.encode_image_to_base64_opencv(path) is None
+    assert core.encode_image_to_base64(path)
+
+
+def test_opencv_ignores_exif_orientation_like_pillow(tmp_path):
+    path = tmp_path / "rotated.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW to display
+    Image.new("RGB", (3000, 2000), (200, 120, 40)).save(path, "JPEG", exif=exif)
+
+    opencv = core.encode_image_to_base64_opencv(path)
+    if opencv is None:
+        return  # opencv not installed
+    assert _decode(opencv).size == _decode(core.encode_image_to_base64_pillow(path)).size == (1024, 683)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_transparent_webp_is_flattened_onto_white, test_animated_webp_is_left_to_pillow,
+                 test_opencv_ignores_exif_orientation_like_pillow):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+            print(f"{test.__name__}: OK")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Checks the exiftool -stay_open client: argfile escaping, and reply and status
+parsing against a fake exiftool that speaks the same protocol
+"""
+
+import subprocess
+import sys
+sys.path.append('.')
+
+import pytest
+
+from backend.image_tagger import core
+
+
+# Reads -@ - argument lines like exiftool -stay_open. Per command it prints
+# "got <hex of each raw argument>" to stdout, then the -echo4 text to stderr
+# (with ${status} expanded unless "old" was passed) and "{ready<N>}" to stdout.
+FAKE_EXIFTOOL = r'''
+import sys, time
+stdin, stdout, stderr = sys.stdin.buffer, sys.stdout.buffer, sys.stderr.buffer
+args = []
+for line in stdin:
+    arg = line.rstrip(b"\n")
+    if args[-1:] == [b"-stay_open"] and arg == b"False":
+        break
+    if not arg.startswith(b"-execute"):
+        args.append(arg)
+        continue
+    seq = arg[len(b"-execute"):]
+    echo = args[args.index(b"-echo4") + 1]
+    args = args[:args.index(b"-echo4")]
+    if b"hang" in args:
+        time.sleep(30)
+    if b"die" in args:
+        sys.exit(1)
+    status = b"0"
+    if b"fail" in args:
+        stderr.write(b"Error: File not found - fail\n")
+        status = b"1"
+    stdout.write(b"got " + b" ".join(a.hex().encode() for a in args) + b"\n")
+    stderr.write((echo if b"old" in args else echo.replace(b"${status}", status)) + b"\n")
+    stdout.write(b"{ready" + seq + b"}\n")
+    stdout.flush()
+    stderr.flush()
+    args = []
+'''
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    script = tmp_path / "fake_exiftool.py"
+    script.write_text(FAKE_EXIFTOOL)
+
+    def start(self):
+        self._proc = subprocess.Popen([sys.executable, str(script)], stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    monkeypatch.setattr(core._ExifToolDaemon, "_start", start)
+    daemon = core._ExifToolDaemon()
+    yield daemon
+    daemon.close()
+
+
+def _received(stdout):
+    """The raw arguments the fake reported for one command"""
+    assert stdout.startswith("got ")
+    return [bytes.fromhex(arg) for arg in stdout.split()[1:]]
+
+
+def test_argfile_args_passes_plain_arguments_through():
+    args = ["-json", "-ImageDescription=A dog", "/photos/a b.jpg"]
+    assert core._argfile_args(args) is args
+
+
+def test_argfile_args_escapes_multiline_values():
+    args = ["-ImageDescription=First line\nSecond line\r\nC:\\temp", "-overwrite_original", "/photos/a.jpg"]
+    assert core._argfile_args(args) == [
+        "-ec",
+        "-ImageDescription=First line\\nSecond line\\r\\nC:\\\\temp",
+        "-overwrite_original",
+        "/photos/a.jpg",
+    ]
+
+
+def test_argfile_args_refuses_what_it_cannot_carry():
+    # -ec does not decode file names, so they cannot be escaped
+    assert core._argfile_args(["-ImageDescription=x", "/photos/new\nline.jpg"]) is None
+    assert core._argfile_args(["-ImageDescription=a\nb", "C:\\photos\\a.jpg"]) is None
+    # Leading "#" would be read as a comment, surrounding whitespace is stripped
+    assert core._argfile_args(["#not-a-comment.jpg"]) is None
+    assert core._argfile_args(["-ImageDescription= padded "]) is None
+    assert core._argfile_args([""]) is None
+
+
+def test_execute_parses_reply_and_status(daemon):
+    rc, out, err = daemon.execute(["-json", "/photos/a.jpg"])
+    assert rc == 0
+    assert _received(out) == [b"-json", b"/photos/a.jpg"]
+    assert err == ""
+
+    rc, out, err = daemon.execute(["fail"])
+    assert rc == 1
+    assert err == "Error: File not found - fail\n"  # the status line itself is removed
+
+    # Same process, next sequence number
+    assert daemon._seq == 2
+    assert daemon.execute(["-ver"])[0] == 0
+
+
+def test_execute_guesses_status_when_exiftool_does_not_expand_it(daemon):
+    assert daemon.execute(["old"])[0] == 0
+    rc, _, err = daemon.execute(["old", "fail"])
+    assert rc == 1
+    assert err.startswith("Error:")
+
+
+def test_execute_sends_undecodable_file_names_as_their_bytes(daemon):
+    name = b"/photos/caf\xe9.jpg".decode("utf-8", "surrogateescape")
+    rc, out, _ = daemon.execute([name])
+    assert rc == 0
+    assert _received(out) == [b"/photos/caf\xe9.jpg"]
+
+
+def test_execute_restarts_after_timeout_and_exit(daemon):
+    assert daemon.execute(["hang"], timeout_seconds=0.5) == (124, "", "Timeout after 0.5s")
+    assert daemon._proc is None
+    assert daemon.execute(["-ver"])[0] == 0
+
+    with pytest.raises(OSError):
+        daemon.execute(["die"])
+    assert daemon._proc is None
+    assert daemon.execute(["-ver"])[0] == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
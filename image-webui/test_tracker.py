@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Checks the processed-file tracker: reading the legacy text format, the SQLite
+round trip, importing the text tracker and falling back to it
+"""
+
+import os
+import sqlite3
+import sys
+sys.path.append('.')
+
+import pytest
+
+from backend.image_tagger import core
+
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    """Point the tracker at tmp_path and give each test a fresh tracker state."""
+    def configure(sqlite_path=None):
+        sqlite_path = sqlite_path or tmp_path / "data" / "tracking.sqlite"
+        config = tmp_path / "config.yaml"
+        config.write_text(f"tracking_db_path: {tmp_path / 'image-tagger.db'}\n"
+                          f"tracking_sqlite_path: {sqlite_path}\n")
+        monkeypatch.setattr(core, "_SYSTEM_CONFIG_PATH", config)
+        core.clear_config_cache()
+        return tmp_path / "image-tagger.db", sqlite_path
+
+    def reset():
+        with core._processed_lock:
+            core._tracker_pending.clear()
+            core._close_tracker()
+            core._tracker_failed_path = None
+            core._legacy_cache = (None, {})
+        core.clear_config_cache()
+
+    reset()
+    yield configure
+    reset()
+
+
+def _image(path, content=b"not really a jpeg"):
+    path.write_bytes(content)
+    return path
+
+
+def test_read_legacy_tracker_formats(tmp_path):
+    legacy = tmp_path / "image-tagger.db"
+    legacy.write_text(
+        "/photos/a.jpg:aaa\n"
+        "/photos/b.jpg:bbb\t1234\t1700000000000000000\n"
+        "/photos/with:colon.jpg:ccc\n"
+        "\n"
+        "no separator here\n"
+        "/photos/a.jpg:ddd\n"  # a later line for the same path wins
+    )
+    rows = {row[0]: row for row in core._read_legacy_tracker(legacy)}
+    assert rows == {
+        "/photos/a.jpg": ("/photos/a.jpg", "ddd", None, None),
+        "/photos/b.jpg": ("/photos/b.jpg", "bbb", 1234, 1700000000000000000),
+        "/photos/with:colon.jpg": ("/photos/with:colon.jpg", "ccc", None, None),
+    }
+
+
+def test_read_legacy_tracker_ignores_missing_empty_and_sqlite_files(tmp_path):
+    assert core._read_legacy_tracker(tmp_path / "missing.db") is None
+
+    empty = tmp_path / "empty.db"
+    empty.write_bytes(b"")
+    assert core._read_legacy_tracker(empty) is None
+
+    converted = tmp_path / "converted.db"
+    sqlite3.connect(converted).execute("CREATE TABLE t (x)").connection.close()
+    assert core._read_legacy_tracker(converted) is None
+
+
+def test_round_trip(tracker, tmp_path):
+    legacy, sqlite_path = tracker()
+    image = _image(tmp_path / "a.jpg")
+    gone = _image(tmp_path / "b.jpg")
+
+    assert not core.is_file_processed(image)
+    core.mark_file_as_processed(image)
+    core.mark_file_as_processed(gone)
+    assert core.is_file_processed(image)
+    assert core.tracked_unchanged({image: image.stat()}) == {image}
+
+    # Rewritten with different content: neither the stat nor the checksum match
+    _image(image, b"different content")
+    assert core.tracked_unchanged({image: image.stat()}) == set()
+    assert not core.is_file_processed(image)
+
+    gone.unlink()
+    assert core.clean_processed_db() == 1
+    with sqlite3.connect(sqlite_path) as conn:
+        paths = [path for (path,) in conn.execute("SELECT path FROM processed")]
+    assert paths == [str(image)]
+    assert not legacy.exists()  # the text tracker is never created in SQLite mode
+
+
+def test_text_tracker_is_imported_but_left_alone(tracker, tmp_path):
+    legacy, sqlite_path = tracker()
+    image = _image(tmp_path / "a.jpg")
+    checksum = core.get_file_checksum(image)
+    legacy.write_text(f"{image}:{checksum}\n")
+    before = legacy.read_bytes()
+
+    assert core.is_file_processed(image)
+    core.mark_file_as_processed(_image(tmp_path / "b.jpg"))
+    core.flush_processed_db()
+
+    # Still the same text file, so the standalone CLI can keep appending to it
+    assert legacy.read_bytes() == before
+    assert not legacy.with_name(legacy.name + ".txt").exists()
+
+    # Lines the CLI appends later are picked up the next time the tracker opens
+    later = _image(tmp_path / "c.jpg", b"third")
+    with open(legacy, "a") as f:
+        f.write(f"{later}:{core.get_file_checksum(later)}\n")
+    with core._processed_lock:
+        core._close_tracker()
+    assert core.is_file_processed(later)
+
+
+def test_falls_back_to_text_tracker_when_sqlite_is_unwritable(tracker, tmp_path):
+    # A file where the database's directory should be: the database can't be created
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    legacy, _ = tracker(sqlite_path=blocker / "tracking.sqlite")
+    image = _image(tmp_path / "a.jpg")
+
+    assert not core.is_file_processed(image)
+    core.mark_file_as_processed(image)
+    assert legacy.read_text() == f"{image}:{core.get_file_checksum(image)}\n"
+    assert core.is_file_processed(image)
+
+    os.remove(image)
+    assert core.clean_processed_db() == 1
+    assert legacy.read_text() == ""
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))